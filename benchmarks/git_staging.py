@@ -0,0 +1,65 @@
+"""
+benchmarks/git_staging.py
+
+This script compares staging a generated flake with one "git add" per top-level entry against a single "git add --all".
+
+Usage: python benchmarks/git_staging.py [max-files]
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+def write_flake(folder: str, files: int):
+    for i in range(files):
+        with open(os.path.join(folder, f'file{i}.nix'), "w") as file:
+            file.write(f'{{ sha256 = "{i}"; }}\n')
+
+def git(folder: str, *args):
+    subprocess.check_output(["git", *args], stderr=subprocess.STDOUT, cwd=folder)
+
+def per_file(folder: str) -> int:
+    git(folder, "init")
+    entries = [ entry for entry in os.listdir(folder) if entry != ".git" ]
+    for entry in entries:
+        git(folder, "add", entry)
+    return 1 + len(entries)
+
+def batched(folder: str) -> int:
+    git(folder, "init")
+    git(folder, "add", "--all", ".")
+    return 2
+
+def timed(function, files: int):
+    with tempfile.TemporaryDirectory() as folder:
+        write_flake(folder, files)
+        start = time.perf_counter()
+        processes = function(folder)
+        return processes, time.perf_counter() - start
+
+def main(maxFiles: int):
+    files = 4
+    while files <= maxFiles:
+        beforeProcesses, before = timed(per_file, files)
+        afterProcesses, after = timed(batched, files)
+        print(f'{files:5} files: per file {beforeProcesses:5} processes {before * 1000:9.1f}ms, batched {afterProcesses} processes {after * 1000:7.1f}ms ({before / after:.1f}x)')
+        files *= 4
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
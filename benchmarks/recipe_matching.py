@@ -0,0 +1,83 @@
+"""
+benchmarks/recipe_matching.py
+
+This script compares matching flakes to recipes one by one against the batch matching API.
+
+Usage: python benchmarks/recipe_matching.py [recipes] [flakes]
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pythonedanixflakes.recipe.flake_recipe import FlakeRecipe
+from pythonedanixflakes.recipe.recipe_index import RecipeIndex
+
+import random
+import time
+from types import SimpleNamespace
+
+TYPES = [ None, "setuptools", "poetry", "pep517", "flit" ]
+
+class SyntheticRecipe(FlakeRecipe):
+    """
+    Recipe built in memory, for benchmarking purposes.
+    """
+    @classmethod
+    def should_initialize(cls) -> bool:
+        return False
+
+    @classmethod
+    def supports(cls, flake) -> bool:
+        return False
+
+def synthetic_recipes(count: int):
+    result = []
+    for i in range(count):
+        flakes = [ { f'pkg{i}': f'{i % 7}.{j}.0' } for j in range(3) ] + [ { f'pkg{i}': f'{i % 7}.*' } ]
+        result.append(type(f'Recipe{i}', (SyntheticRecipe,), { "_flakes": flakes, "_type": TYPES[i % len(TYPES)] }))
+    return result
+
+def synthetic_flakes(count: int, recipes: int):
+    result = []
+    for _ in range(count):
+        package = SimpleNamespace(get_type=lambda t=random.choice(TYPES): t)
+        i = random.randrange(recipes * 2)
+        result.append(SimpleNamespace(name=f'pkg{i}', version=f'{i % 7}.{random.randrange(5)}.0', python_package=package))
+    return result
+
+def main(recipes: int, flakes: int):
+    random.seed(0)
+    recipeClasses = synthetic_recipes(recipes)
+    targets = synthetic_flakes(flakes, recipes)
+
+    start = time.perf_counter()
+    expected = [ FlakeRecipe.most_similar(recipeClasses, flake) for flake in targets ]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = RecipeIndex(recipeClasses)
+    actual = index.best_matches(targets)
+    batch_time = time.perf_counter() - start
+
+    assert actual == expected, "batch matching differs from the scalar path"
+    print(f'{recipes} recipes, {flakes} flakes')
+    print(f'scalar: {scalar_time:.3f}s')
+    print(f'batch:  {batch_time:.3f}s ({scalar_time / batch_time:.1f}x)')
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
@@ -0,0 +1,82 @@
+"""
+benchmarks/remove_duplicates.py
+
+This script compares the quadratic list-based deduplication with OrderedDeduplication, on growing dependency lists.
+
+Usage: python benchmarks/remove_duplicates.py [max-dependencies] [max-dependencies-for-the-list-version]
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pythonedanixflakes.recipe.ordered_deduplication import OrderedDeduplication
+
+import time
+
+class SyntheticPackage():
+
+    def __init__(self, name: str, version: str):
+        self.name = name
+        self.version = version
+        self._key = (OrderedDeduplication.normalize_name(name), version)
+
+    def __eq__(self, other):
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def dedup_key(self):
+        return self._key
+
+def categories(dependencies: int):
+    # five input categories, each one repeating a third of the previous one
+    result = []
+    for category in range(5):
+        start = category * dependencies // 3
+        result.append([ SyntheticPackage(f'pkg_{i % dependencies}' if category % 2 else f'pkg-{i % dependencies}', "1.0") for i in range(start, start + dependencies) ])
+    return result
+
+def quadratic(*lists):
+    result = []
+    for lst in lists:
+        for item in lst:
+            if item not in result:
+                result.append(item)
+    return result
+
+def timed(function, lists):
+    start = time.perf_counter()
+    result = function(*lists)
+    return result, time.perf_counter() - start
+
+def main(maxDependencies: int, maxQuadratic: int):
+    size = 10
+    while size <= maxDependencies:
+        lists = categories(size)
+        actual, after = timed(OrderedDeduplication.remove_duplicates, lists)
+        if size <= maxQuadratic:
+            expected, before = timed(quadratic, lists)
+            assert actual == expected
+            print(f'{size:6} deps: hashed {after * 1000:8.2f}ms, list {before * 1000:10.2f}ms ({before / after:.1f}x)')
+        else:
+            print(f'{size:6} deps: hashed {after * 1000:8.2f}ms, list skipped')
+        size *= 10
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000, int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
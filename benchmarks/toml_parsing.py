@@ -0,0 +1,64 @@
+"""
+benchmarks/toml_parsing.py
+
+This script parses a synthetic corpus of recipe.toml files with each available TOML backend.
+
+Usage: python benchmarks/toml_parsing.py [recipes] [flakes-per-recipe]
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pythonedanixflakes.recipe.toml_parser import TomlParser
+
+import tempfile
+import time
+
+def write_corpus(folder: str, recipes: int, flakes: int):
+    result = []
+    for i in range(recipes):
+        path = os.path.join(folder, f'recipe{i}', "recipe.toml")
+        os.makedirs(os.path.dirname(path))
+        lines = [ "[flake]" ]
+        lines.extend(f'pkg{i}-{j} = ">={j}.0,<{j + 1}.0"' for j in range(flakes))
+        lines.extend([ "", "[flake.metadata]", f'type = "{"setuptools" if i % 2 else "poetry"}"', "" ])
+        with open(path, "w") as file:
+            file.write("\n".join(lines))
+        result.append(path)
+    return result
+
+def main(recipes: int, flakes: int):
+    backends = TomlParser.available_backends()
+    if not backends:
+        print(f'No TOML backend available (tried {", ".join(TomlParser.BACKENDS)})')
+        return
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_corpus(folder, recipes, flakes)
+        print(f'{recipes} recipe.toml files, {flakes} flakes each')
+        timings = {}
+        for backend in backends:
+            start = time.perf_counter()
+            for path in paths:
+                TomlParser.load(path, backend)
+            timings[backend] = time.perf_counter() - start
+        slowest = max(timings.values())
+        for backend, elapsed in timings.items():
+            print(f'{backend:8} {elapsed:.3f}s ({slowest / elapsed:.1f}x)')
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
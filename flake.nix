@@ -62,6 +62,7 @@
 
             nativeBuildInputs = with python.pkgs; [ pip pkgs.jq poetry-core ];
             propagatedBuildInputs = with python.pkgs; [
+              packaging
               pythoneda-base
               pythoneda-event-nix-flakes
               pythoneda-shared-git
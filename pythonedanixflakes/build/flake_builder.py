@@ -29,13 +29,15 @@ from pythonedaeventnixflakes.recipe.flake_recipe import FlakeRecipe
 from pythonedaeventnix.nix_build_failed import NixBuildFailed
 from pythonedasharednix.sha256_mismatch_error import Sha256MismatchError
 
+import asyncio
 import logging
 import os
 import re
 import shutil
 import subprocess
 import tempfile
-from typing import List, Type
+import time
+from typing import Any, Dict, List, Tuple, Type
 
 class FlakeBuilder(EventListener):
     """
@@ -50,6 +52,7 @@ class FlakeBuilder(EventListener):
         - Flakes: The entities to build.
     """
     _forensic_folder = None
+    _staging_stats = { "builds": 0, "files": 0, "processes": 0, "seconds": 0.0 }
 
     @classmethod
     def forensic_folder(cls, folder: str):
@@ -70,13 +73,109 @@ class FlakeBuilder(EventListener):
         return [ BuildFlakeRequested ]
 
     @classmethod
-    def listenBuildFlakeRequested(cls, event: BuildFlakeRequested) -> FlakeBuilt:
+    async def listenBuildFlakeRequested(cls, event: BuildFlakeRequested) -> FlakeBuilt:
         """
         Receives BuildFlakeRequested events.
+        The build runs in non-blocking subprocesses, so other events keep being processed meanwhile.
         :param event: The event.
         :type event: BuildFlakeRequested from pythonedaeventnixflakes.build.build_flake_requested
         """
-        return cls.build_flake(event, os.path.join(event.flakes_folder, f'{event.package_name}-{event.package_version}'))
+        return await cls.build_flake_async(event, os.path.join(event.flakes_folder, f'{event.package_name}-{event.package_version}'))
+
+    @classmethod
+    async def build_flake_async(cls, event: BuildFlakeRequested, flakeFolder: str) -> FlakeBuilt:
+        """
+        Builds a flake without blocking the event loop.
+        Cancelling the calling task kills the running git or nix process.
+        :param event: The event with the flake information.
+        :type event: BuildFlakeRequested from pythonedaeventnixflakes.build.build_flake_requested
+        :param flakeFolder: The flake folder.
+        :type flakeFolder: str
+        :return: A FlakeBuilt event.
+        :rtype: FlakeBuilt from pythonedaeventnixflakes.build.flake_built
+        """
+        loop = asyncio.get_running_loop()
+        temp_dir = await loop.run_in_executor(None, tempfile.mkdtemp)
+        try:
+            files = await loop.run_in_executor(None, cls.copy_folder_contents, flakeFolder, temp_dir)
+            await cls.git_stage_tree_async(temp_dir, files)
+            try:
+                logging.getLogger(__name__).debug(f'Building the flake in {temp_dir}')
+                await cls.nix_build_async(temp_dir, firstAttempt=True)
+            except Sha256MismatchError as mismatch:
+                await loop.run_in_executor(None, cls.replace_sha256_in_files, temp_dir, mismatch.sha256)
+                await cls.nix_build_async(temp_dir, firstAttempt=False)
+                if os.path.exists(os.path.join(temp_dir, '.git')):
+                    await loop.run_in_executor(None, shutil.rmtree, os.path.join(temp_dir, '.git'))
+                await loop.run_in_executor(None, cls.copy_folder_contents, temp_dir, flakeFolder)
+        finally:
+            await asyncio.shield(loop.run_in_executor(None, shutil.rmtree, temp_dir, True))
+
+        return FlakeBuilt(event.package_name, event.package_version, flakeFolder)
+
+    @classmethod
+    async def run_async(cls, args: List[str], folder: str, mergeStderr: bool = False) -> Tuple[int, str, str]:
+        """
+        Runs a command in a non-blocking subprocess.
+        If the calling task gets cancelled, the subprocess is killed before propagating the cancellation.
+        :param args: The command and its arguments.
+        :type args: List[str]
+        :param folder: The working folder.
+        :type folder: str
+        :param mergeStderr: Whether to merge the standard error into the standard output.
+        :type mergeStderr: bool
+        :return: The exit code, the standard output and the standard error.
+        :rtype: Tuple[int, str, str]
+        """
+        process = await asyncio.create_subprocess_exec(*args, cwd=folder, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT if mergeStderr else asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                logging.getLogger(__name__).debug(f'Killing {" ".join(args)} in {folder}')
+                process.kill()
+                await asyncio.shield(process.wait())
+            raise
+        return (process.returncode, (stdout or b"").decode("utf-8", "replace"), (stderr or b"").decode("utf-8", "replace"))
+
+    @classmethod
+    async def git_stage_tree_async(cls, folder: str, files: int = None):
+        """
+        Initializes a git repository in given folder, and stages all its contents, without blocking the event loop.
+        :param folder: The folder.
+        :type folder: str
+        :param files: The number of files in the folder, if known (see copy_folder_contents()).
+        :type files: int
+        """
+        logging.getLogger(__name__).debug(f'Initializing a git repository in {folder}, and adding all files')
+        start = time.perf_counter()
+        code, output, _ = await cls.run_async(['git', 'init'], folder, mergeStderr=True)
+        if code != 0:
+            raise GitInitFailed(folder, output)
+        code, output, _ = await cls.run_async(['git', 'add', '--all', '.'], folder, mergeStderr=True)
+        if code != 0:
+            raise GitAddFailed(folder, output)
+        cls.record_staging(folder, files, 2, time.perf_counter() - start)
+
+    @classmethod
+    async def nix_build_async(cls, folder: str, firstAttempt = True):
+        """
+        Performs a "nix build" on given folder, without blocking the event loop.
+        :param folder: The folder.
+        :type folder: str
+        :param firstAttempt: Whether it's the first attempt or not.
+        :type firstAttempt: bool
+        """
+        code, stdout, stderr = await cls.run_async(['nix', 'build', '.'], folder)
+        if code != 0:
+            sha256 = cls.extract_sha256_from_output(stderr)
+            if sha256:
+                raise Sha256MismatchError(sha256)
+            else:
+                logging.getLogger(__name__).error(stdout)
+                logging.getLogger(__name__).error(stderr)
+                await asyncio.get_running_loop().run_in_executor(None, cls.copy_folder_contents, folder, cls._forensic_folder)
+                raise NixBuildFailed(cls._forensic_folder, stdout)
 
     @classmethod
     def build_flake(cls, event: BuildFlakeRequested, flakeFolder: str) -> FlakeBuilt:
@@ -92,10 +191,8 @@ class FlakeBuilder(EventListener):
         result = None
 
         with tempfile.TemporaryDirectory() as temp_dir:
-            cls.copy_folder_contents(flakeFolder, temp_dir)
-            cls.git_init(temp_dir)
-            for file in os.listdir(temp_dir):
-                cls.git_add(temp_dir, file)
+            files = cls.copy_folder_contents(flakeFolder, temp_dir)
+            cls.git_stage_tree(temp_dir, files)
             try:
                 logging.getLogger(__name__).debug(f'Building the flake in {temp_dir}')
                 cls.nix_build(temp_dir, firstAttempt=True)
@@ -109,18 +206,28 @@ class FlakeBuilder(EventListener):
         return FlakeBuilt(event.package_name, event.package_version, flakeFolder)
 
     @classmethod
-    def copy_folder_contents(cls, source: str, destination: str):
+    def copy_folder_contents(cls, source: str, destination: str) -> int:
         """
         Copies the contents of a folder into a destination folder.
         :param source: The source folder.
         :type source: str
         :param destination: The destination folder.
         :type destination: str
+        :return: The number of files copied.
+        :rtype: int
         """
         logging.getLogger(__name__).debug(f'Copying {source} contents to {destination}')
         if os.path.exists(destination):
             shutil.rmtree(destination)
-        shutil.copytree(source, destination)
+        copied = 0
+
+        def copy(src, dst, *, follow_symlinks=True):
+            nonlocal copied
+            copied += 1
+            return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+        shutil.copytree(source, destination, copy_function=copy)
+        return copied
 
     @classmethod
     def git_init(cls, folder: str):
@@ -136,6 +243,63 @@ class FlakeBuilder(EventListener):
         except subprocess.CalledProcessError:
             raise GitInitFailed(folder, output.stdout)
 
+    @classmethod
+    def git_stage_tree(cls, folder: str, files: int = None):
+        """
+        Initializes a git repository in given folder, and stages all its contents, with a fixed number of git processes whatever the number of files.
+        :param folder: The folder.
+        :type folder: str
+        :param files: The number of files in the folder, if known (see copy_folder_contents()).
+        :type files: int
+        """
+        start = time.perf_counter()
+        cls.git_init(folder)
+        cls.git_add_all(folder)
+        cls.record_staging(folder, files, 2, time.perf_counter() - start)
+
+    @classmethod
+    def record_staging(cls, folder: str, files: int, processes: int, elapsed: float):
+        """
+        Accounts for the staging of given folder in the staging statistics.
+        It does not walk the folder: the number of files comes from whoever filled it.
+        :param folder: The folder.
+        :type folder: str
+        :param files: The number of files staged, or None if unknown.
+        :type files: int
+        :param processes: The number of git processes spawned.
+        :type processes: int
+        :param elapsed: The seconds spent.
+        :type elapsed: float
+        """
+        stats = FlakeBuilder._staging_stats
+        stats["builds"] += 1
+        stats["files"] += files or 0
+        stats["processes"] += processes
+        stats["seconds"] += elapsed
+        logging.getLogger(__name__).debug(f'Staged {"?" if files is None else files} files in {folder} with {processes} git processes in {elapsed * 1000:.1f}ms')
+
+    @classmethod
+    def staging_stats(cls) -> Dict[str, Any]:
+        """
+        Retrieves the accumulated statistics of staging flakes in git.
+        :return: The number of builds, files staged (when known), git processes spawned and seconds spent.
+        :rtype: Dict[str, Any]
+        """
+        return dict(FlakeBuilder._staging_stats)
+
+    @classmethod
+    def git_add_all(cls, folder: str):
+        """
+        Performs a "git add --all" on given folder, staging the whole tree in a single git invocation.
+        :param folder: The folder.
+        :type folder: str
+        """
+        logging.getLogger(__name__).debug(f'Adding all files to the git repository in {folder}')
+        try:
+            subprocess.check_output(['git', 'add', '--all', '.'], stderr=subprocess.STDOUT, cwd=folder)
+        except subprocess.CalledProcessError as err:
+            raise GitAddFailed(folder, err.output)
+
     @classmethod
     def git_add(cls, folder: str, file: str):
         """
@@ -323,15 +323,23 @@ class Flake(Entity, EventListener, EventEmitter):
         :type flake: Flake from pythonedanixflakes.flake
         """
         result = None
-        flakeRecipeClasses = Ports.instance().resolveFlakeRecipeRepo().find_recipe_classes_by_flake(flake)
-        similarities = {}
-        for recipeClass in flakeRecipeClasses:
-            similarities[recipeClass] = recipeClass.similarity(flake)
-        matches = sorted([aux for aux in similarities.keys() if similarities[aux] != 0.0], key=lambda recipeClass: similarities[recipeClass], reverse=True)
-        if matches and len(matches) > 0:
-            result = matches[0](flake)
+        recipeClass = Ports.instance().resolveFlakeRecipeRepo().find_best_recipe_class_by_flake(flake)
+        if recipeClass:
+            result = recipeClass(flake)
         return result
 
+    @classmethod
+    def find_recipes_by_flakes(cls, flakes: List) -> List:
+        """
+        Retrieves the best recipe for each of given Flakes, matching them all at once.
+        :param flakes: The flakes.
+        :type flakes: List[Flake from pythonedanixflakes.flake]
+        :return: The recipe for each flake (or None), in the same order.
+        :rtype: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        """
+        recipeClasses = Ports.instance().resolveFlakeRecipeRepo().find_best_recipe_classes_by_flakes(flakes)
+        return [ recipeClass(flake) if recipeClass else None for recipeClass, flake in zip(recipeClasses, flakes) ]
+
     @classmethod
     def cleanup_nixpkgs_dependencies(cls, inputs: List[PythonPackage], inNixpkgs: List[PythonPackage]) -> List[PythonPackage]:
         """
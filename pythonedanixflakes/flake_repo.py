@@ -24,8 +24,10 @@ from PythonEDANixFlakes.flake_created import FlakeCreated
 from PythonEDANixFlakes.recipe.flake_recipe import FlakeRecipe
 
 import abc
+import logging
+import os
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 
 class FlakeRepo(Repo, abc.ABC):
     """
@@ -60,13 +62,13 @@ class FlakeRepo(Repo, abc.ABC):
         raise NotImplementedError("find_by_name_and_version() must be implemented by subclasses")
 
     @abc.abstractmethod
-    def create(self, flake: Flake, content: List[Dict[str, str]], recipe: FlakeRecipe) -> FlakeCreated:
+    def create(self, flake: Flake, content: Iterable[Dict[str, str]], recipe: FlakeRecipe) -> FlakeCreated:
         """
         Creates the flake.
         :param flake: The flake.
         :type: Flake from pythonedanixflakes.flake
-        :param content: The flake content.
-        :type content: List[Dict[str, str]]
+        :param content: The flake content. It can be a generator yielding each file as soon as it gets rendered.
+        :type content: Iterable[Dict[str, str]]
         :param recipe: The flake recipe.
         :type recipe: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
         :return: A FlakeCreated event.
@@ -74,6 +76,77 @@ class FlakeRepo(Repo, abc.ABC):
         """
         raise NotImplementedError("create() must be implemented by subclasses")
 
+    def create_streaming(self, flake: Flake, entries: Iterable[Tuple[str, str, str]], recipe: FlakeRecipe) -> FlakeCreated:
+        """
+        Creates the flake, from files rendered one at a time.
+        Each file gets rendered right before create() consumes it, so only one of them is in memory at a time.
+        :param flake: The flake.
+        :type: Flake from pythonedanixflakes.flake
+        :param entries: The folder, path and contents of each file.
+        :type entries: Iterable[Tuple[str, str, str]]
+        :param recipe: The flake recipe.
+        :type recipe: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
+        :return: A FlakeCreated event.
+        :rtype: FlakeCreated from pythonedaeventnixflakes.flake_created
+        """
+        return self.create(flake, ({ "folder": folder, "path": path, "contents": contents } for folder, path, contents in entries), recipe)
+
+    def create_many(self, requests: Iterable[Tuple[Flake, Iterable[Tuple[str, str, str]], FlakeRecipe]]) -> List:
+        """
+        Creates many flakes in one go.
+        Subclasses able to write them more efficiently in bulk should override it, keeping one outcome per request consumed, in the same order:
+        callers match each outcome with its flake by position, and fail if the number of outcomes differs.
+        :param requests: The flake, the files (as in create_streaming()) and the recipe of each flake.
+        :type requests: Iterable[Tuple[Flake, Iterable[Tuple[str, str, str]], FlakeRecipe]]
+        :return: For each flake, in order, its FlakeCreated event, or the error raised when creating it.
+        :rtype: List
+        """
+        result = []
+        for flake, entries, recipe in requests:
+            try:
+                result.append(self.create_streaming(flake, entries, recipe))
+            except Exception as error:
+                logging.getLogger(__name__).error(f'Could not create flake {flake.name}-{flake.version}: {error}')
+                result.append(error)
+        return result
+
+    def has_outputs(self, name: str, version: str, files: List[str], url: str = None) -> bool:
+        """
+        Checks if the files generated for given flake are still there, so it does not need to be generated again.
+        By default, files are looked for under the url if it is a local path; otherwise, the flake itself is looked for.
+        Subclasses storing flakes elsewhere should override it.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        :param files: The generated files, relative to the flake.
+        :type files: List[str]
+        :param url: The url of the flake, as url_for_flake() returned it when it was generated.
+        :type url: str
+        :return: True if they are still there.
+        :rtype: bool
+        """
+        root = self.__class__.local_path(url)
+        if root is not None:
+            return all(os.path.exists(os.path.join(root, file)) for file in files)
+        return self.find_by_name_and_version(name, version) is not None
+
+    @classmethod
+    def local_path(cls, url: str) -> str:
+        """
+        Retrieves the local folder given url points to.
+        :param url: The url.
+        :type url: str
+        :return: The folder, or None if the url is not local.
+        :rtype: str
+        """
+        if not url:
+            return None
+        for prefix in [ "git+file://", "file://", "path:" ]:
+            if url.startswith(prefix):
+                return url[len(prefix):].split("?")[0]
+        return url if os.path.isabs(url) else None
+
     @abc.abstractmethod
     def url_for_flake(self, name: str, version: str) -> str:
         """
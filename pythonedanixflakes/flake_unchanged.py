@@ -0,0 +1,92 @@
+"""
+pythonedanixflakes/flake_unchanged.py
+
+This file defines the FlakeUnchanged class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.event import Event
+from pythoneda.value_object import attribute, primary_key_attribute
+
+class FlakeUnchanged(Event):
+    """
+    Represents the event of a flake not being generated again, since nothing it's generated from changed.
+
+    Class name: FlakeUnchanged
+
+    Responsibilities:
+        - Represent the fact that a flake is already up to date.
+
+    Collaborators:
+        - BaseFlakeRecipe: Emits it instead of FlakeCreated.
+    """
+    def __init__(self, packageName: str, packageVersion: str, fingerprint: str, flakeUrl: str = None):
+        """
+        Creates a new FlakeUnchanged instance.
+        :param packageName: The name of the package.
+        :type packageName: str
+        :param packageVersion: The version of the package.
+        :type packageVersion: str
+        :param fingerprint: The fingerprint of the flake inputs.
+        :type fingerprint: str
+        :param flakeUrl: The url of the existing flake, if known.
+        :type flakeUrl: str
+        """
+        super().__init__()
+        self._package_name = packageName
+        self._package_version = packageVersion
+        self._fingerprint = fingerprint
+        self._flake_url = flakeUrl
+
+    @property
+    @primary_key_attribute
+    def package_name(self) -> str:
+        """
+        Retrieves the name of the package.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._package_name
+
+    @property
+    @primary_key_attribute
+    def package_version(self) -> str:
+        """
+        Retrieves the version of the package.
+        :return: Such version.
+        :rtype: str
+        """
+        return self._package_version
+
+    @property
+    @attribute
+    def fingerprint(self) -> str:
+        """
+        Retrieves the fingerprint of the flake inputs.
+        :return: Such fingerprint.
+        :rtype: str
+        """
+        return self._fingerprint
+
+    @property
+    @attribute
+    def flake_url(self) -> str:
+        """
+        Retrieves the url of the existing flake.
+        :return: Such url.
+        :rtype: str
+        """
+        return self._flake_url
@@ -21,20 +21,33 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from pythoneda.ports import Ports
 from pythonedaeventnixflakes.flake_created import FlakeCreated
 from pythonedanixflakes.flake import Flake
+from pythonedanixflakes.flake_unchanged import FlakeUnchanged
 from pythonedanixflakes.license import License
+from pythonedanixflakes.recipe.dependency_partition import DependencyPartition
+from pythonedanixflakes.recipe.flake_batch_report import FlakeBatchReport
+from pythonedanixflakes.recipe.flake_fingerprint import FlakeFingerprint
+from pythonedanixflakes.recipe.flake_fingerprint_store import FlakeFingerprintStore
 from pythonedanixflakes.recipe.flake_recipe import FlakeRecipe
 from pythonedanixflakes.recipe.formatted_flake import FormattedFlake
 from pythonedanixflakes.recipe.formatted_flake_python_package import FormattedFlakePythonPackage
 from pythonedanixflakes.recipe.formatted_nixpkgs_python_package import FormattedNixpkgsPythonPackage
 from pythonedanixflakes.recipe.formatted_python_package_list import FormattedPythonPackageList
-from pythonedasharednix.nix_template import NixTemplate
+from pythonedanixflakes.recipe.formatted_python_package_pool import FormattedPythonPackagePool
+from pythonedanixflakes.recipe.lazy_subtemplates import LazySubtemplates
+from pythonedanixflakes.recipe.nix_template_cache import NixTemplateCache
+from pythonedanixflakes.recipe.placeholder_dispatch import PlaceholderDispatch
+from pythonedanixflakes.recipe.recipe_manifest import RecipeManifest
 from pythonedasharedpythonpackages.python_package import PythonPackage
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import inspect
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 class BaseFlakeRecipe(FlakeRecipe):
     """
@@ -55,23 +68,20 @@ class BaseFlakeRecipe(FlakeRecipe):
         :type flake: Flake from pythonedanixflakes.flake
         """
         super().__init__(flake)
-        self._native_build_inputs_subtemplates = self.extract_dep_templates(flake, flake.native_build_inputs)
-        self._propagated_build_inputs_subtemplates = self.extract_dep_templates(flake, flake.propagated_build_inputs)
-        self._build_inputs_subtemplates = self.extract_dep_templates(flake, flake.build_inputs)
-        self._check_inputs_subtemplates = self.extract_dep_templates(flake, flake.check_inputs)
-        self._optional_build_inputs_subtemplates = self.extract_dep_templates(flake, flake.optional_build_inputs)
-        self._subtemplates = self.extract_dep_templates(flake, list(
-                set(flake.native_build_inputs)
-            | set(flake.propagated_build_inputs)
-            | set(flake.build_inputs)
-            | set(flake.check_inputs)
-            | set(flake.optional_build_inputs)))
-        all = list(
-                set(flake.native_build_inputs)
-            | set(flake.propagated_build_inputs)
-            | set(flake.build_inputs)
-            | set(flake.check_inputs)
-            | set(flake.optional_build_inputs))
+        self._dependency_partition = None
+        self._native_build_inputs_subtemplates = LazySubtemplates(self.extract_dep_template, lambda: self.dependency_partition().category(DependencyPartition.NATIVE_BUILD_INPUTS))
+        self._propagated_build_inputs_subtemplates = LazySubtemplates(self.extract_dep_template, lambda: self.dependency_partition().category(DependencyPartition.PROPAGATED_BUILD_INPUTS))
+        self._build_inputs_subtemplates = LazySubtemplates(self.extract_dep_template, lambda: self.dependency_partition().category(DependencyPartition.BUILD_INPUTS))
+        self._check_inputs_subtemplates = LazySubtemplates(self.extract_dep_template, lambda: self.dependency_partition().category(DependencyPartition.CHECK_INPUTS))
+        self._optional_build_inputs_subtemplates = LazySubtemplates(self.extract_dep_template, lambda: self.dependency_partition().category(DependencyPartition.OPTIONAL_BUILD_INPUTS))
+        self._subtemplates = LazySubtemplates(self.extract_dep_template, lambda: self.dependency_partition().all())
+        self._formatted_flake = None
+
+    _template_references = {}
+    _render_workers = None
+    _fingerprint_store = None
+    _fingerprint_store_write_every = 100
+    _template_references_lock = threading.Lock()
 
     class Subtemplates(Enum):
         """
@@ -113,23 +123,287 @@ class BaseFlakeRecipe(FlakeRecipe):
         """
         return False
 
+    @classmethod
+    def use_fingerprint_store(cls, store: FlakeFingerprintStore, writeEvery: int = 100):
+        """
+        Specifies the store of the fingerprints flakes were generated from, to skip regenerating unchanged flakes.
+        process() writes the store in batches, since each write serializes the whole store: callers must write it
+        once they are done (see FlakeFingerprintStore.write()). process_many() is the bulk path, and writes it once per batch.
+        :param store: The store, or None to always generate the flakes.
+        :type store: FlakeFingerprintStore from pythonedanixflakes.recipe.flake_fingerprint_store
+        :param writeEvery: The number of flakes recorded by process() after which the store gets written. None or 0 leave it to the caller.
+        :type writeEvery: int
+        """
+        BaseFlakeRecipe._fingerprint_store = store
+        BaseFlakeRecipe._fingerprint_store_write_every = writeEvery
+
     def process(self) -> FlakeCreated:
         """
         Processes the recipe.
-        :return: A FlakeCreated event.
+        :return: A FlakeCreated event, or a FlakeUnchanged one if the flake was already generated from the same inputs (see use_fingerprint_store()).
         :rtype: FlakeCreated from pythonedaeventnixflakes.flake_created
         """
         result = None
-        renderedTemplates = []
         templates = Ports.instance().resolveNixTemplateRepo().find_flake_templates_by_recipe(self)
         if templates:
-            for template in [ NixTemplate(t["folder"], t["path"], t["contents"]) for t in templates ]:
-                renderedTemplates.append({ "folder": template.folder, "path": template.path, "contents": template.render(self.flake, self) })
-            result = Ports.instance().resolveFlakeRepo().create(self.flake, renderedTemplates, self)
+            fingerprint, result = self.check_unchanged(templates)
+            if result is None:
+                self.validate_placeholders(templates)
+                flakeRepo = Ports.instance().resolveFlakeRepo()
+                files = []
+                result = flakeRepo.create_streaming(self.flake, self.track_files(self.stream_templates(templates), files), self)
+                self.record_fingerprint(fingerprint, files, flakeRepo)
+                store = BaseFlakeRecipe._fingerprint_store
+                writeEvery = BaseFlakeRecipe._fingerprint_store_write_every
+                if store and writeEvery and store.unwritten >= writeEvery:
+                    store.write()
         else:
             logging.getLogger(__name__).critical(f'No templates provided by recipe {Path(inspect.getsourcefile(self.__class__)).parent}')
         return result
 
+    @classmethod
+    def process_many(cls, flakes: List[Flake]) -> FlakeBatchReport:
+        """
+        Processes many flakes with this recipe class, fetching the templates and finding their placeholders only once.
+        Each flake is checked and rendered only when the flake repository gets to it. A flake failing does not stop the others.
+        :param flakes: The flakes.
+        :type flakes: List[Flake from pythonedanixflakes.flake]
+        :return: The outcome of each flake, plus the statistics of the batch.
+        :rtype: FlakeBatchReport from pythonedanixflakes.recipe.flake_batch_report
+        :raise RuntimeError: If the flake repository does not return one outcome per flake it created (see FlakeRepo.create_many()).
+        """
+        result = FlakeBatchReport(cls)
+        if not flakes:
+            return result
+        start = time.perf_counter()
+        templateStats = NixTemplateCache.stats()
+        templates = Ports.instance().resolveNixTemplateRepo().find_flake_templates_by_recipe(cls(flakes[0]))
+        if not templates:
+            logging.getLogger(__name__).critical(f'No templates provided by recipe {Path(inspect.getsourcefile(cls)).parent}')
+            for flake in flakes:
+                result.add(flake, error=ValueError(f'No templates provided by recipe {cls.__name__}'))
+            return result
+        flakeRepo = Ports.instance().resolveFlakeRepo()
+        outcomes = {}
+        pending = []
+
+        def requests():
+            # each recipe is created, checked and rendered only when the flake repository asks for its flake,
+            # so at most the recipe of the flake being written is alive.
+            for index, flake in enumerate(flakes):
+                try:
+                    recipe = cls(flake)
+                    fingerprint, unchanged = recipe.check_unchanged(templates)
+                    if unchanged is None:
+                        recipe.validate_placeholders(templates)
+                except Exception as error:
+                    outcomes[index] = (None, error)
+                    continue
+                if unchanged is None:
+                    files = []
+                    pending.append((index, flake, fingerprint, files))
+                    yield (recipe.flake, recipe.track_files(recipe.stream_templates(templates), files), recipe)
+                else:
+                    outcomes[index] = (unchanged, None)
+
+        results = list(flakeRepo.create_many(requests()))
+        if len(results) != len(pending):
+            raise RuntimeError(f'{flakeRepo.__class__.__name__}.create_many() returned {len(results)} outcomes for {len(pending)} flakes')
+        for (index, flake, fingerprint, files), outcome in zip(pending, results):
+            if isinstance(outcome, Exception):
+                outcomes[index] = (None, outcome)
+            else:
+                outcomes[index] = (outcome, None)
+                cls.record_flake_fingerprint(flake, fingerprint, files, flakeRepo)
+        if BaseFlakeRecipe._fingerprint_store:
+            BaseFlakeRecipe._fingerprint_store.write()
+        for index, flake in enumerate(flakes):
+            event, error = outcomes.get(index, (None, RuntimeError(f'The flake repository reported no outcome for {flake.name}-{flake.version}')))
+            result.add(flake, event, error)
+        after = NixTemplateCache.stats()
+        result.stats.update({
+            "flakes": len(flakes),
+            "rendered": len(pending),
+            "seconds": time.perf_counter() - start,
+            "template_parse_seconds": after["parse_seconds"] - templateStats["parse_seconds"],
+            "template_parse_seconds_saved": after["saved_seconds"] - templateStats["saved_seconds"]
+        })
+        logging.getLogger(__name__).info(f'{result} ({result.stats["template_parse_seconds_saved"]:.3f}s of template parsing saved)')
+        return result
+
+    def check_unchanged(self, templates: List[Dict[str, str]]) -> Tuple[str, FlakeUnchanged]:
+        """
+        Checks if the flake was already generated from the same inputs, when a fingerprint store is in use.
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The fingerprint (None without a store), and a FlakeUnchanged event if the flake is up to date and its files are still in the flake repository.
+        :rtype: Tuple[str, FlakeUnchanged from pythonedanixflakes.flake_unchanged]
+        """
+        store = BaseFlakeRecipe._fingerprint_store
+        if not store:
+            return (None, None)
+        fingerprint = FlakeFingerprint.of(self, templates)
+        flakeRepo = Ports.instance().resolveFlakeRepo()
+        if store.is_unchanged(self._flake.name, self._flake.version, fingerprint, lambda entry: flakeRepo.has_outputs(self._flake.name, self._flake.version, entry.get("files", []), entry.get("url", None))):
+            logging.getLogger(__name__).debug(f'Flake {self._flake.name}-{self._flake.version} is up to date')
+            return (fingerprint, FlakeUnchanged(self._flake.name, self._flake.version, fingerprint, store.entry_for(self._flake.name, self._flake.version).get("url", None)))
+        return (fingerprint, None)
+
+    def record_fingerprint(self, fingerprint: str, files: List[str], flakeRepo):
+        """
+        Records the fingerprint the flake was just generated from, when a fingerprint store is in use.
+        :param fingerprint: The fingerprint.
+        :type fingerprint: str
+        :param files: The generated files.
+        :type files: List[str]
+        :param flakeRepo: The flake repository.
+        :type flakeRepo: FlakeRepo from pythonedanixflakes.flake_repo
+        """
+        self.__class__.record_flake_fingerprint(self._flake, fingerprint, files, flakeRepo)
+
+    @classmethod
+    def record_flake_fingerprint(cls, flake: Flake, fingerprint: str, files: List[str], flakeRepo):
+        """
+        Records the fingerprint given flake was just generated from with this recipe class, when a fingerprint store is in use.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :param fingerprint: The fingerprint.
+        :type fingerprint: str
+        :param files: The generated files.
+        :type files: List[str]
+        :param flakeRepo: The flake repository.
+        :type flakeRepo: FlakeRepo from pythonedanixflakes.flake_repo
+        """
+        store = BaseFlakeRecipe._fingerprint_store
+        if store and fingerprint:
+            store.record(flake.name, flake.version, fingerprint, RecipeManifest.key_for(cls), files, flakeRepo.url_for_flake(flake.name, flake.version))
+
+    @classmethod
+    def render_parallelism(cls, workers: int):
+        """
+        Specifies how many templates to render at the same time, in a thread pool.
+        :param workers: The number of threads. None, 0 or 1 render the templates one after another.
+        :type workers: int
+        """
+        cls._render_workers = workers
+
+    @staticmethod
+    def render_template(recipeClass, folder: str, path: str, contents: str, flake: FormattedFlake, recipe) -> Dict[str, str]:
+        """
+        Renders a single template.
+        :param recipeClass: The recipe class the template belongs to.
+        :type recipeClass: type
+        :param folder: The template folder.
+        :type folder: str
+        :param path: The template path.
+        :type path: str
+        :param contents: The template contents.
+        :type contents: str
+        :param flake: The flake, as the templates see it.
+        :type flake: FormattedFlake from pythonedanixflakes.recipe.formatted_flake
+        :param recipe: The recipe.
+        :type recipe: BaseFlakeRecipe from pythonedanixflakes.recipe.base_flake_recipe
+        :return: The rendered template, with its "folder", "path" and "contents".
+        :rtype: Dict[str, str]
+        """
+        template = NixTemplateCache.template(recipeClass, folder, path, contents)
+        return { "folder": template.folder, "path": template.path, "contents": template.render(flake, recipe) }
+
+    def render_templates(self, templates: List[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """
+        Renders given templates, concurrently if so configured (see render_parallelism()).
+        Before rendering concurrently, the dependency subtemplates are built upfront (see precompute()),
+        since their memos are not locked and the formatted packages are shared with other flakes.
+        Rendered templates are yielded in the same order as the templates, as soon as they and all the previous ones are ready.
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The rendered templates.
+        :rtype: Iterator[Dict[str, str]]
+        """
+        workers = self.__class__._render_workers
+        if not workers or workers <= 1 or len(templates) <= 1:
+            for template in templates:
+                yield self.render_template(self.__class__, template["folder"], template["path"], template["contents"], self.flake, self)
+            return
+        self.precompute()
+        with ThreadPoolExecutor(max_workers=min(workers, len(templates))) as executor:
+            futures = [ executor.submit(BaseFlakeRecipe.render_template, self.__class__, template["folder"], template["path"], template["contents"], self.flake, self) for template in templates ]
+            for future in futures:
+                yield future.result()
+
+    @staticmethod
+    def track_files(entries: Iterable[Tuple[str, str, str]], files: List[str]) -> Iterator[Tuple[str, str, str]]:
+        """
+        Passes given rendered templates through, collecting their paths.
+        :param entries: The folder, path and contents of each rendered template.
+        :type entries: Iterable[Tuple[str, str, str]]
+        :param files: The list to append the paths to.
+        :type files: List[str]
+        :return: The same entries.
+        :rtype: Iterator[Tuple[str, str, str]]
+        """
+        for folder, path, contents in entries:
+            files.append(os.path.join(folder, path) if folder else path)
+            yield (folder, path, contents)
+
+    def stream_templates(self, templates: List[Dict[str, str]]) -> Iterator[Tuple[str, str, str]]:
+        """
+        Renders given templates lazily: each template is rendered only when the consumer asks for it,
+        so only one rendered file is in memory at a time.
+        When rendering concurrently (see render_parallelism()), templates are rendered ahead instead.
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The folder, path and contents of each rendered template.
+        :rtype: Iterator[Tuple[str, str, str]]
+        """
+        for rendered in self.render_templates(templates):
+            yield (rendered["folder"], rendered["path"], rendered["contents"])
+
+    @classmethod
+    def template_references(cls, templates: List[Dict[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Retrieves the placeholders the templates of this recipe class use, finding them only the first time,
+        until the recipe gets reloaded.
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The scope ("flake" or "recipe") and name of each placeholder.
+        :rtype: List[Tuple[str, str]]
+        """
+        result = BaseFlakeRecipe._template_references.get(cls, None)
+        if result is None:
+            references = {}
+            for template in templates:
+                for reference in PlaceholderDispatch.references(template["contents"]):
+                    references[reference] = None
+            result = list(references)
+            with BaseFlakeRecipe._template_references_lock:
+                BaseFlakeRecipe._template_references[cls] = result
+        return result
+
+    def validate_placeholders(self, templates: List[Dict[str, str]]) -> List[str]:
+        """
+        Checks this recipe, and its flake, provide every placeholder given templates use.
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The placeholders checked.
+        :rtype: List[str]
+        :raise RecipeDoesNotSupportPlaceholder: If any placeholder is not provided.
+        """
+        return PlaceholderDispatch.validate(self, self.__class__.template_references(templates))
+
+    @classmethod
+    def recipe_reloaded(cls, recipeClass, changedFiles: List[str]):
+        """
+        Discards the parsed templates and the placeholders of a recipe class after it got reloaded.
+        :param recipeClass: The recipe class.
+        :type recipeClass: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
+        :param changedFiles: The files that changed.
+        :type changedFiles: List[str]
+        """
+        NixTemplateCache.invalidate(recipeClass)
+        with BaseFlakeRecipe._template_references_lock:
+            BaseFlakeRecipe._template_references.pop(recipeClass, None)
+
     def extract_dep_templates(self, flake: Flake, inputs: List[PythonPackage]) -> Dict[str, str]:
         """
         Extracts the dependency templates.
@@ -140,39 +414,67 @@ class BaseFlakeRecipe(FlakeRecipe):
         :return: The dependency templates.
         :rtype: Dict[str, str]
         """
-        if inputs:
-            nixpkgs_deps = FormattedPythonPackageList(self.remove_duplicates([FormattedNixpkgsPythonPackage(dep) for dep in inputs if dep.in_nixpkgs()]))
-            flake_deps = FormattedPythonPackageList(self.remove_duplicates([FormattedFlakePythonPackage(dep) for dep in inputs if not dep.in_nixpkgs()]))
-            all_deps = FormattedPythonPackageList(flake_deps.list + nixpkgs_deps.list)
-
-            nixpkgs_declaration = FormattedPythonPackageList(nixpkgs_deps.list, "nixpkgs_declaration")
-            flakes_declaration = FormattedPythonPackageList(flake_deps.list, "flake_declaration")
-            nixpkgs_as_parameter_to_package_nix = FormattedPythonPackageList(nixpkgs_deps.list, "as_parameter_to_package_nix")
-            flakes_as_parameter_to_package_nix = FormattedPythonPackageList(flake_deps.list, "as_parameter_to_package_nix")
-            declaration = FormattedPythonPackageList(all_deps.list, "name")
-            nixpkgs_overrides = FormattedPythonPackageList(nixpkgs_deps.list, "overrides")
-        else:
-            nixpkgs_deps = FormattedPythonPackageList([])
-            flake_deps = FormattedPythonPackageList([])
-            all_deps = FormattedPythonPackageList([])
-            nixpkgs_declaration = FormattedPythonPackageList([])
-            flakes_declaration = FormattedPythonPackageList([])
-            nixpkgs_as_parameter_to_package_nix = FormattedPythonPackageList([])
-            flakes_as_parameter_to_package_nix = FormattedPythonPackageList([])
-            declaration = FormattedPythonPackageList([])
-            nixpkgs_overrides = FormattedPythonPackageList([])
-
-        return {
-            BaseFlakeRecipe.Subtemplates.NIXPKGS_DEPS: nixpkgs_deps,
-            BaseFlakeRecipe.Subtemplates.FLAKE_DEPS: flake_deps,
-            BaseFlakeRecipe.Subtemplates.ALL_DEPS: all_deps,
-            BaseFlakeRecipe.Subtemplates.NIXPKGS_DECLARATION: nixpkgs_declaration,
-            BaseFlakeRecipe.Subtemplates.FLAKES_DECLARATION: flakes_declaration,
-            BaseFlakeRecipe.Subtemplates.NIXPKGS_AS_PARAMETER_TO_PACKAGE_NIX: nixpkgs_as_parameter_to_package_nix,
-            BaseFlakeRecipe.Subtemplates.FLAKES_AS_PARAMETER_TO_PACKAGE_NIX: flakes_as_parameter_to_package_nix,
-            BaseFlakeRecipe.Subtemplates.DECLARATION: declaration,
-            BaseFlakeRecipe.Subtemplates.NIXPKGS_OVERRIDES: nixpkgs_overrides
-            }
+        subtemplates = LazySubtemplates(self.extract_dep_template, DependencyPartition({ "inputs": inputs }).category("inputs"))
+        return { kind: subtemplates.get(kind) for kind in BaseFlakeRecipe.Subtemplates }
+
+    def precompute(self):
+        """
+        Builds and renders all dependency subtemplates upfront, including the ones of all categories together,
+        so rendering the templates afterwards only reads them, and can do so from several threads.
+        :return: This recipe.
+        :rtype: BaseFlakeRecipe from pythonedanixflakes.recipe.base_flake_recipe
+        """
+        for subtemplates in [ self._native_build_inputs_subtemplates, self._propagated_build_inputs_subtemplates, self._build_inputs_subtemplates, self._check_inputs_subtemplates, self._optional_build_inputs_subtemplates, self._subtemplates ]:
+            for kind in BaseFlakeRecipe.Subtemplates:
+                subtemplate = subtemplates.get(kind)
+                if subtemplate is not None:
+                    str(subtemplate)
+        return self
+
+    def dependency_partition(self) -> DependencyPartition:
+        """
+        Retrieves the partition of the flake inputs into nixpkgs and flake dependencies, computing it the first time.
+        :return: Such partition.
+        :rtype: DependencyPartition from pythonedanixflakes.recipe.dependency_partition
+        """
+        if self._dependency_partition is None:
+            self._dependency_partition = DependencyPartition.of(self._flake)
+        return self._dependency_partition
+
+    def extract_dep_template(self, inputs: Tuple[List[PythonPackage], List[PythonPackage]], kind: Subtemplates, subtemplates: LazySubtemplates) -> FormattedPythonPackageList:
+        """
+        Extracts a single dependency template.
+        :param inputs: The python packages already in nixpkgs, and the ones packaged as flakes, without duplicates.
+        :type inputs: Tuple[List[PythonPackage from pythonedanixsharedpythonpackages.python_package], List[PythonPackage from pythonedanixsharedpythonpackages.python_package]]
+        :param kind: The kind of subtemplate.
+        :type kind: BaseFlakeRecipe.Subtemplates from pythonedanixflakes.recipe.base_flake_recipe
+        :param subtemplates: The other subtemplates of the same inputs, to build this one upon.
+        :type subtemplates: LazySubtemplates from pythonedanixflakes.recipe.lazy_subtemplates
+        :return: The dependency template, or None if the kind is unknown.
+        :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
+        """
+        nixpkgs, flakes = inputs
+        if not nixpkgs and not flakes:
+            return FormattedPythonPackageList([])
+        if kind == BaseFlakeRecipe.Subtemplates.NIXPKGS_DEPS:
+            return FormattedPythonPackageList([FormattedPythonPackagePool.get(FormattedNixpkgsPythonPackage, dep) for dep in nixpkgs])
+        if kind == BaseFlakeRecipe.Subtemplates.FLAKE_DEPS:
+            return FormattedPythonPackageList([FormattedPythonPackagePool.get(FormattedFlakePythonPackage, dep) for dep in flakes])
+        if kind == BaseFlakeRecipe.Subtemplates.ALL_DEPS:
+            return FormattedPythonPackageList(tuple(subtemplates[BaseFlakeRecipe.Subtemplates.FLAKE_DEPS].items) + tuple(subtemplates[BaseFlakeRecipe.Subtemplates.NIXPKGS_DEPS].items))
+        if kind == BaseFlakeRecipe.Subtemplates.NIXPKGS_DECLARATION:
+            return FormattedPythonPackageList(subtemplates[BaseFlakeRecipe.Subtemplates.NIXPKGS_DEPS].items, "nixpkgs_declaration")
+        if kind == BaseFlakeRecipe.Subtemplates.FLAKES_DECLARATION:
+            return FormattedPythonPackageList(subtemplates[BaseFlakeRecipe.Subtemplates.FLAKE_DEPS].items, "flake_declaration")
+        if kind == BaseFlakeRecipe.Subtemplates.NIXPKGS_AS_PARAMETER_TO_PACKAGE_NIX:
+            return FormattedPythonPackageList(subtemplates[BaseFlakeRecipe.Subtemplates.NIXPKGS_DEPS].items, "as_parameter_to_package_nix")
+        if kind == BaseFlakeRecipe.Subtemplates.FLAKES_AS_PARAMETER_TO_PACKAGE_NIX:
+            return FormattedPythonPackageList(subtemplates[BaseFlakeRecipe.Subtemplates.FLAKE_DEPS].items, "as_parameter_to_package_nix")
+        if kind == BaseFlakeRecipe.Subtemplates.DECLARATION:
+            return FormattedPythonPackageList(subtemplates[BaseFlakeRecipe.Subtemplates.ALL_DEPS].items, "name")
+        if kind == BaseFlakeRecipe.Subtemplates.NIXPKGS_OVERRIDES:
+            return FormattedPythonPackageList(subtemplates[BaseFlakeRecipe.Subtemplates.NIXPKGS_DEPS].items, "overrides")
+        return None
 
     @property
     def flake(self) -> FormattedFlake:
@@ -181,7 +483,9 @@ class BaseFlakeRecipe(FlakeRecipe):
         :return: A FormattedFlake.
         :rtype: FormattedFlake from pythonedanixflakes.recipe.formatted_flake
         """
-        return FormattedFlake(self._flake)
+        if self._formatted_flake is None:
+            self._formatted_flake = FormattedFlake(self._flake)
+        return self._formatted_flake
 
     def repo_sha256(self) -> str:
         """
@@ -531,12 +835,7 @@ class BaseFlakeRecipe(FlakeRecipe):
         :return: A list of formatted Python packages.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.remove_duplicates(
-            self.native_build_inputs_flakes_as_parameter_to_package_nix().list,
-                self.propagated_build_inputs_flakes_as_parameter_to_package_nix().list,
-                self.build_inputs_flakes_as_parameter_to_package_nix().list,
-                self.check_inputs_flakes_as_parameter_to_package_nix().list,
-                self.optional_build_inputs_flakes_as_parameter_to_package_nix().list), "as_parameter_to_package_nix")
+        return self._subtemplates.get(BaseFlakeRecipe.Subtemplates.FLAKES_AS_PARAMETER_TO_PACKAGE_NIX, [])
 
     def nixpkgs_as_parameter_to_package_nix(self) -> FormattedPythonPackageList:
         """
@@ -544,12 +843,7 @@ class BaseFlakeRecipe(FlakeRecipe):
         :return: A list of formatted Python packages.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.remove_duplicates(
-            self.native_build_inputs_nixpkgs_as_parameter_to_package_nix().list,
-            self.propagated_build_inputs_nixpkgs_as_parameter_to_package_nix().list,
-            self.build_inputs_nixpkgs_as_parameter_to_package_nix().list,
-            self.check_inputs_nixpkgs_as_parameter_to_package_nix().list,
-            self.optional_build_inputs_nixpkgs_as_parameter_to_package_nix().list), "as_parameter_to_package_nix")
+        return self._subtemplates.get(BaseFlakeRecipe.Subtemplates.NIXPKGS_AS_PARAMETER_TO_PACKAGE_NIX, [])
 
     def flakes_declaration(self) -> FormattedPythonPackageList:
         """
@@ -557,12 +851,7 @@ class BaseFlakeRecipe(FlakeRecipe):
         :return: A list of formatted Python packages.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.remove_duplicates(
-            self.native_build_inputs_flakes_declaration().list,
-            self.propagated_build_inputs_flakes_declaration().list,
-            self.build_inputs_flakes_declaration().list,
-            self.check_inputs_flakes_declaration().list,
-            self.optional_build_inputs_flakes_declaration().list), "flake_declaration")
+        return self._subtemplates.get(BaseFlakeRecipe.Subtemplates.FLAKES_DECLARATION, [])
 
     def declaration(self) -> FormattedPythonPackageList:
         """
@@ -570,9 +859,6 @@ class BaseFlakeRecipe(FlakeRecipe):
         :return: A list of formatted Python packages.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.remove_duplicates(
-            self.native_build_inputs_declaration().list,
-            self.propagated_build_inputs_declaration().list,
-            self.build_inputs_declaration().list,
-            self.check_inputs_declaration().list,
-            self.optional_build_inputs_declaration().list), "name")
+        return self._subtemplates.get(BaseFlakeRecipe.Subtemplates.DECLARATION, [])
+
+FlakeRecipe.add_reload_listener(BaseFlakeRecipe.recipe_reloaded)
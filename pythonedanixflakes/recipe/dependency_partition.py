@@ -0,0 +1,134 @@
+"""
+pythonedanixflakes/recipe/dependency_partition.py
+
+This file defines the DependencyPartition class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.ordered_deduplication import OrderedDeduplication
+
+from typing import Dict, List, Tuple
+
+class DependencyPartition():
+    """
+    Splits the inputs of a flake into dependencies already in nixpkgs and dependencies packaged as flakes.
+
+    Class name: DependencyPartition
+
+    Responsibilities:
+        - Classify every distinct dependency once, in a single pass over all input categories.
+        - Provide the partition of each category, and of all categories together, without duplicates and in order.
+          Across categories, packages are compared by normalized name and version, as OrderedDeduplication does.
+
+    Collaborators:
+        - BaseFlakeRecipe: Builds its dependency subtemplates from the partition.
+    """
+
+    NATIVE_BUILD_INPUTS = "native_build_inputs"
+    PROPAGATED_BUILD_INPUTS = "propagated_build_inputs"
+    BUILD_INPUTS = "build_inputs"
+    CHECK_INPUTS = "check_inputs"
+    OPTIONAL_BUILD_INPUTS = "optional_build_inputs"
+
+    CATEGORIES = [ NATIVE_BUILD_INPUTS, PROPAGATED_BUILD_INPUTS, BUILD_INPUTS, CHECK_INPUTS, OPTIONAL_BUILD_INPUTS ]
+
+    def __init__(self, inputs: Dict[str, List]):
+        """
+        Creates a new DependencyPartition instance.
+        :param inputs: The Python packages of each category.
+        :type inputs: Dict[str, List[PythonPackage from pythonedasharedpythonpackages.python_package]]
+        """
+        super().__init__()
+        self._in_nixpkgs = {}
+        self._categories = {}
+        all_nixpkgs = {}
+        all_flakes = {}
+        for category, deps in inputs.items():
+            nixpkgs = {}
+            flakes = {}
+            for dep in deps or []:
+                in_nixpkgs = self._in_nixpkgs.get(dep, None)
+                if in_nixpkgs is None:
+                    in_nixpkgs = bool(dep.in_nixpkgs())
+                    self._in_nixpkgs[dep] = in_nixpkgs
+                key = (OrderedDeduplication.normalize_name(dep.name), dep.version)
+                if in_nixpkgs:
+                    nixpkgs[dep] = None
+                    all_nixpkgs.setdefault(key, dep)
+                else:
+                    flakes[dep] = None
+                    all_flakes.setdefault(key, dep)
+            self._categories[category] = (list(nixpkgs), list(flakes))
+        self._all = (list(all_nixpkgs.values()), list(all_flakes.values()))
+
+    @classmethod
+    def of(cls, flake):
+        """
+        Builds the partition of the inputs of given flake.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :return: The partition.
+        :rtype: DependencyPartition from pythonedanixflakes.recipe.dependency_partition
+        """
+        return cls({ category: getattr(flake, category) for category in cls.CATEGORIES })
+
+    def in_nixpkgs(self, dep) -> bool:
+        """
+        Checks if given dependency is already in nixpkgs, according to the partition.
+        :param dep: The dependency.
+        :type dep: PythonPackage from pythonedasharedpythonpackages.python_package
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._in_nixpkgs.get(dep, False)
+
+    def category(self, name: str) -> Tuple[List, List]:
+        """
+        Retrieves the partition of given category.
+        :param name: The category.
+        :type name: str
+        :return: The dependencies in nixpkgs, and the ones packaged as flakes.
+        :rtype: Tuple[List, List]
+        """
+        return self._categories.get(name, ([], []))
+
+    def all(self) -> Tuple[List, List]:
+        """
+        Retrieves the partition of all categories together.
+        :return: The dependencies in nixpkgs, and the ones packaged as flakes.
+        :rtype: Tuple[List, List]
+        """
+        return self._all
+
+    def nixpkgs(self, category: str = None) -> List:
+        """
+        Retrieves the dependencies already in nixpkgs.
+        :param category: The category, or None for all of them.
+        :type category: str
+        :return: Such dependencies.
+        :rtype: List[PythonPackage from pythonedasharedpythonpackages.python_package]
+        """
+        return (self.all() if category is None else self.category(category))[0]
+
+    def flakes(self, category: str = None) -> List:
+        """
+        Retrieves the dependencies packaged as flakes.
+        :param category: The category, or None for all of them.
+        :type category: str
+        :return: Such dependencies.
+        :rtype: List[PythonPackage from pythonedasharedpythonpackages.python_package]
+        """
+        return (self.all() if category is None else self.category(category))[1]
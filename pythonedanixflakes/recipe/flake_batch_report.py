@@ -0,0 +1,146 @@
+"""
+pythonedanixflakes/recipe/flake_batch_report.py
+
+This file defines the FlakeBatchReport class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any, Dict, List
+
+class FlakeBatchReport():
+    """
+    Outcome of processing many flakes with the same recipe.
+
+    Class name: FlakeBatchReport
+
+    Responsibilities:
+        - Keep, for each flake and in order, the event produced or the error raised.
+        - Keep the statistics of the batch.
+
+    Collaborators:
+        - BaseFlakeRecipe: Fills the report in process_many().
+    """
+
+    class Entry():
+        """
+        Outcome of processing a single flake.
+
+        Class name: Entry
+
+        Responsibilities:
+            - Hold the flake, and either the event produced or the error raised.
+
+        Collaborators:
+            - None
+        """
+        __slots__ = ("flake", "event", "error")
+
+        def __init__(self, flake, event = None, error: Exception = None):
+            """
+            Creates a new Entry instance.
+            :param flake: The flake.
+            :type flake: Flake from pythonedanixflakes.flake
+            :param event: The event produced, if any.
+            :type event: Event from pythoneda.event
+            :param error: The error raised, if any.
+            :type error: Exception
+            """
+            self.flake = flake
+            self.event = event
+            self.error = error
+
+        @property
+        def succeeded(self) -> bool:
+            """
+            Checks if the flake was processed successfully.
+            :return: True in such case.
+            :rtype: bool
+            """
+            return self.error is None
+
+    def __init__(self, recipeClass):
+        """
+        Creates a new FlakeBatchReport instance.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        """
+        super().__init__()
+        self._recipe_class = recipeClass
+        self._entries = []
+        self._stats = {}
+
+    @property
+    def recipe_class(self):
+        """
+        Retrieves the recipe class.
+        :return: Such class.
+        :rtype: type
+        """
+        return self._recipe_class
+
+    @property
+    def entries(self) -> List[Entry]:
+        """
+        Retrieves the outcome of each flake, in order.
+        :return: Such entries.
+        :rtype: List[FlakeBatchReport.Entry]
+        """
+        return self._entries
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retrieves the statistics of the batch.
+        :return: Such statistics.
+        :rtype: Dict[str, Any]
+        """
+        return self._stats
+
+    def add(self, flake, event = None, error: Exception = None):
+        """
+        Records the outcome of processing given flake.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :param event: The event produced, if any.
+        :type event: Event from pythoneda.event
+        :param error: The error raised, if any.
+        :type error: Exception
+        """
+        self._entries.append(FlakeBatchReport.Entry(flake, event, error))
+
+    def succeeded(self) -> List[Entry]:
+        """
+        Retrieves the flakes processed successfully.
+        :return: Their entries.
+        :rtype: List[FlakeBatchReport.Entry]
+        """
+        return [ entry for entry in self._entries if entry.succeeded ]
+
+    def failed(self) -> List[Entry]:
+        """
+        Retrieves the flakes which could not be processed.
+        :return: Their entries.
+        :rtype: List[FlakeBatchReport.Entry]
+        """
+        return [ entry for entry in self._entries if not entry.succeeded ]
+
+    def __str__(self) -> str:
+        """
+        Summarizes the report.
+        :return: Such summary.
+        :rtype: str
+        """
+        return f'{self._recipe_class.__name__}: {len(self.succeeded())} succeeded, {len(self.failed())} failed'
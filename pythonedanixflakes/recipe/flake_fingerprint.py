@@ -0,0 +1,166 @@
+"""
+pythonedanixflakes/recipe/flake_fingerprint.py
+
+This file defines the FlakeFingerprint class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.dependency_partition import DependencyPartition
+from pythonedanixflakes.recipe.nix_template_cache import NixTemplateCache
+from pythonedanixflakes.recipe.recipe_manifest import RecipeManifest
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+from typing import Dict, List
+
+class FlakeFingerprint():
+    """
+    Deterministic digest of everything a recipe renders a flake from.
+
+    Class name: FlakeFingerprint
+
+    Responsibilities:
+        - Digest the flake name and version, its formatted metadata, its dependency partition, the recipe class, and the templates.
+        - Digest the sources of the recipe class, of its base classes and of the modules formatting the flake,
+          so changing any code that affects the generated files changes the fingerprint too.
+        - Produce the same digest across processes and runs for the same inputs.
+
+    Collaborators:
+        - BaseFlakeRecipe: Skips rendering when the fingerprint of a flake did not change.
+        - FlakeFingerprintStore: Persists the fingerprints.
+        - FormattedFlake: Provides the flake metadata, memoizing the expensive parts.
+    """
+
+    FORMAT_VERSION = 2
+
+    METADATA = [ "version_with_underscores", "description", "license", "sha256", "repo_url", "repo_rev", "repo_owner", "repo_name" ]
+
+    RENDERING_MODULES = [
+        "pythonedanixflakes.license",
+        "pythonedanixflakes.recipe.dependency_partition",
+        "pythonedanixflakes.recipe.formatted_flake",
+        "pythonedanixflakes.recipe.formatted_flake_python_package",
+        "pythonedanixflakes.recipe.formatted_nixpkgs_python_package",
+        "pythonedanixflakes.recipe.formatted_python_package",
+        "pythonedanixflakes.recipe.formatted_python_package_list",
+        "pythonedanixflakes.recipe.lazy_subtemplates",
+        "pythonedanixflakes.recipe.ordered_deduplication" ]
+
+    _recipe_digests = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def source_files(cls, recipeClass) -> List[str]:
+        """
+        Retrieves the files the output of given recipe class depends on: the sources of the class and its recipe base classes,
+        the sources of the modules formatting the flake, and its recipe.toml.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :return: Such files, in a stable order.
+        :rtype: List[str]
+        """
+        result = {}
+        for klass in recipeClass.__mro__:
+            if hasattr(klass, "recipe_toml_file"):
+                source = inspect.getsourcefile(klass)
+                if source:
+                    result[source] = None
+        for module in cls.RENDERING_MODULES:
+            spec = importlib.util.find_spec(module)
+            if spec and spec.origin:
+                result[spec.origin] = None
+        result[recipeClass.recipe_toml_file()] = None
+        return list(result)
+
+    @classmethod
+    def recipe_digest(cls, recipeClass) -> str:
+        """
+        Retrieves the digest of the files the output of given recipe class depends on (see source_files()), which act as the recipe version.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :return: The SHA-256 digest.
+        :rtype: str
+        """
+        files = cls.source_files(recipeClass)
+        stamps = [ RecipeManifest.stamp(file) for file in files ]
+        entry = cls._recipe_digests.get(recipeClass, None)
+        if entry and entry[0] == stamps:
+            return entry[1]
+        digest = hashlib.sha256()
+        for file in files:
+            if os.path.exists(file):
+                with open(file, "rb") as source:
+                    digest.update(source.read())
+            digest.update(b"\0")
+        result = digest.hexdigest()
+        with cls._lock:
+            cls._recipe_digests[recipeClass] = (stamps, result)
+        return result
+
+    @classmethod
+    def package_key(cls, pkg) -> List[str]:
+        """
+        Retrieves what identifies given dependency in the fingerprint.
+        :param pkg: The dependency.
+        :type pkg: PythonPackage from pythonedasharedpythonpackages.python_package
+        :return: Its name and version.
+        :rtype: List[str]
+        """
+        return [ str(pkg.name), str(pkg.version) ]
+
+    @classmethod
+    def inputs_of(cls, recipe, templates: List[Dict[str, str]]) -> Dict:
+        """
+        Collects the inputs of the fingerprint of given recipe.
+        :param recipe: The recipe.
+        :type recipe: BaseFlakeRecipe from pythonedanixflakes.recipe.base_flake_recipe
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The inputs, as JSON-serializable values.
+        :rtype: Dict
+        """
+        partition = recipe.dependency_partition()
+        formattedFlake = recipe.flake
+        return {
+            "version": cls.FORMAT_VERSION,
+            "flake": [ str(recipe._flake.name), str(recipe._flake.version) ],
+            "metadata": { key: str(getattr(formattedFlake, key)()) for key in cls.METADATA },
+            "dependencies": {
+                category: [
+                    [ cls.package_key(pkg) for pkg in partition.nixpkgs(category) ],
+                    [ cls.package_key(pkg) for pkg in partition.flakes(category) ]
+                ] for category in DependencyPartition.CATEGORIES },
+            "recipe": [ RecipeManifest.key_for(recipe.__class__), cls.recipe_digest(recipe.__class__) ],
+            "templates": [ [ str(t["folder"]), str(t["path"]), NixTemplateCache.digest(t["contents"]) ] for t in templates ]
+        }
+
+    @classmethod
+    def of(cls, recipe, templates: List[Dict[str, str]]) -> str:
+        """
+        Computes the fingerprint of given recipe.
+        :param recipe: The recipe.
+        :type recipe: BaseFlakeRecipe from pythonedanixflakes.recipe.base_flake_recipe
+        :param templates: The templates, with their "folder", "path" and "contents".
+        :type templates: List[Dict[str, str]]
+        :return: The fingerprint.
+        :rtype: str
+        """
+        canonical = json.dumps(cls.inputs_of(recipe, templates), sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        return hashlib.sha256(canonical.encode("ascii")).hexdigest()
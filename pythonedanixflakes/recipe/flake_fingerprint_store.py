@@ -0,0 +1,192 @@
+"""
+pythonedanixflakes/recipe/flake_fingerprint_store.py
+
+This file defines the FlakeFingerprintStore class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, List
+
+class FlakeFingerprintStore():
+    """
+    On-disk record of the fingerprint each flake was last generated from.
+
+    Class name: FlakeFingerprintStore
+
+    Responsibilities:
+        - Remember, for each flake name and version, its fingerprint, the recipe and the files generated.
+        - Tell whether a flake would be generated again from the same inputs, and its generated files are still there.
+        - Count the entries recorded since the store was last written, so callers can write it in batches.
+
+    Collaborators:
+        - BaseFlakeRecipe: Skips unchanged flakes, and records the generated ones.
+        - FlakeFingerprint: Computes the fingerprints.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str, entries: Dict[str, Dict] = None):
+        """
+        Creates a new FlakeFingerprintStore instance.
+        :param path: The path of the store file.
+        :type path: str
+        :param entries: The entries, indexed by flake key.
+        :type entries: Dict[str, Dict]
+        """
+        super().__init__()
+        self._path = path
+        self._entries = entries or {}
+        self._unwritten = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        """
+        Retrieves the path of the store file.
+        :return: Such path.
+        :rtype: str
+        """
+        return self._path
+
+    @property
+    def unwritten(self) -> int:
+        """
+        Retrieves the number of entries recorded or discarded since the store was last written.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._unwritten
+
+    @classmethod
+    def key_for(cls, name: str, version: str) -> str:
+        """
+        Retrieves the key identifying given flake in the store.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        :return: Such key.
+        :rtype: str
+        """
+        return f'{name}-{version}'
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Loads the store from given file.
+        :param path: The store file.
+        :type path: str
+        :return: The store. It's empty if the file does not exist, is corrupt or is not compatible.
+        :rtype: FlakeFingerprintStore from pythonedanixflakes.recipe.flake_fingerprint_store
+        """
+        entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as file:
+                    contents = json.load(file)
+            except ValueError as error:
+                logging.getLogger(__name__).warning(f'Ignoring corrupt flake fingerprint store {path}: {error}')
+            else:
+                if isinstance(contents, dict) and contents.get("version", None) == cls.FORMAT_VERSION:
+                    entries = contents.get("flakes", {})
+                else:
+                    logging.getLogger(__name__).info(f'Ignoring incompatible flake fingerprint store {path}')
+        return cls(path, entries)
+
+    def write(self):
+        """
+        Writes the store to disk.
+        """
+        folder = os.path.dirname(self._path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._lock:
+            contents = { "version": self.__class__.FORMAT_VERSION, "flakes": dict(self._entries) }
+            self._unwritten = 0
+        temp_file = f'{self._path}.{threading.get_ident()}.tmp'
+        with open(temp_file, "w") as file:
+            json.dump(contents, file, separators=(",", ":"), sort_keys=True)
+        os.replace(temp_file, self._path)
+
+    def entry_for(self, name: str, version: str) -> Dict:
+        """
+        Retrieves the entry of given flake.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        :return: The entry, or None if the flake was never recorded.
+        :rtype: Dict
+        """
+        return self._entries.get(self.__class__.key_for(name, version), None)
+
+    def is_unchanged(self, name: str, version: str, fingerprint: str, outputsExist: Callable[[Dict], bool] = None) -> bool:
+        """
+        Checks if given flake was last generated from the same fingerprint, and its recorded outputs still exist.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        :param fingerprint: The current fingerprint.
+        :type fingerprint: str
+        :param outputsExist: The check of the recorded outputs. It receives the entry, with its "files" and "url".
+        :type outputsExist: Callable[[Dict], bool]
+        :return: True in such case.
+        :rtype: bool
+        """
+        entry = self.entry_for(name, version)
+        if entry is None or entry.get("fingerprint", None) != fingerprint:
+            return False
+        if outputsExist is not None and not outputsExist(entry):
+            logging.getLogger(__name__).info(f'The files generated for flake {name}-{version} are gone')
+            return False
+        return True
+
+    def record(self, name: str, version: str, fingerprint: str, recipe: str, files: List[str], url: str = None):
+        """
+        Records the fingerprint given flake was generated from.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        :param fingerprint: The fingerprint.
+        :type fingerprint: str
+        :param recipe: The recipe class key.
+        :type recipe: str
+        :param files: The generated files.
+        :type files: List[str]
+        :param url: The url of the generated flake, if known.
+        :type url: str
+        """
+        with self._lock:
+            self._entries[self.__class__.key_for(name, version)] = { "fingerprint": fingerprint, "recipe": recipe, "files": files, "url": url }
+            self._unwritten += 1
+
+    def forget(self, name: str, version: str):
+        """
+        Discards the entry of given flake, so it gets generated again.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        """
+        with self._lock:
+            if self._entries.pop(self.__class__.key_for(name, version), None) is not None:
+                self._unwritten += 1
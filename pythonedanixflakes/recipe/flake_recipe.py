@@ -23,19 +23,27 @@ from pythoneda.value_object import primary_key_attribute
 from pythonedanixflakes.flake import Flake
 from pythonedanixflakes.recipe.empty_flake_metadata_section_in_recipe_toml import EmptyFlakeMetadataSectionInRecipeToml
 from pythonedanixflakes.recipe.empty_flake_section_in_recipe_toml import EmptyFlakeSectionInRecipeToml
+from pythonedanixflakes.recipe.lazy_recipe_attribute import LazyRecipeAttribute
+from pythonedanixflakes.recipe.lru_cache import LruCache
 from pythonedanixflakes.recipe.missing_flake_section_in_recipe_toml import MissingFlakeSectionInRecipeToml
 from pythonedanixflakes.recipe.missing_flake_version_spec_in_recipe_toml import MissingFlakeVersionSpecInRecipeToml
 from pythonedanixflakes.recipe.missing_recipe_toml import MissingRecipeToml
 from pythonedanixflakes.recipe.missing_type_in_flake_metadata_section_in_recipe_toml import MissingTypeInFlakeMetadataSectionInRecipeToml
 from pythonedanixflakes.recipe.more_than_one_flake_in_recipe_toml import MoreThanOneFlakeInRecipeToml
+from pythonedanixflakes.recipe.ordered_deduplication import OrderedDeduplication
+from pythonedanixflakes.recipe.recipe_index import RecipeIndex
+from pythonedanixflakes.recipe.recipe_toml_cache import RecipeTomlCache
+from pythonedanixflakes.recipe.version_spec import VersionSpec
 
 import abc
+from concurrent.futures import ThreadPoolExecutor
 import inspect
 import logging
 import os
 from pathlib import Path
-import toml
-from typing import Dict, List
+import threading
+from typing import Dict, List, Tuple
+import weakref
 
 class FlakeRecipe(Entity, abc.ABC):
     """
@@ -50,7 +58,15 @@ class FlakeRecipe(Entity, abc.ABC):
         - Flakes: To build them.
     """
 
-    _flakes = []
+    _flakes = LazyRecipeAttribute("_loaded_flakes", [])
+    _type = LazyRecipeAttribute("_loaded_type", None)
+    _initialization_locks = {}
+    _initialization_locks_lock = threading.Lock()
+    _manifest = None
+    _reload_listeners = []
+    _reload_listeners_lock = threading.Lock()
+    _similarity_cache = LruCache(16384)
+    _match_cache = LruCache(4096)
 
     def __init__(self, flake: Flake):
         """
@@ -74,11 +90,146 @@ class FlakeRecipe(Entity, abc.ABC):
     @classmethod
     def initialize(cls):
         """
-        Initializes the class.
+        Initializes the class, even if it was already initialized.
+        Classes get initialized automatically the first time _flakes or _type are accessed.
         """
         if cls.should_initialize():
-            cls._flakes = cls.supported_flakes()
-            cls._type = cls.flake_type()
+            with cls.initialization_lock():
+                entry = None
+                if FlakeRecipe._manifest:
+                    entry = FlakeRecipe._manifest.entry_for(cls)
+                if entry:
+                    flakes = entry["flakes"]
+                    flake_type = entry["type"]
+                else:
+                    flakes = cls.supported_flakes()
+                    flake_type = cls.flake_type()
+                cls._loaded_flakes = flakes
+                cls._loaded_type = flake_type
+                cls._initialized = True
+            FlakeRecipe._similarity_cache.discard_if(lambda key: key[0] is cls)
+            FlakeRecipe._match_cache.clear()
+
+    @classmethod
+    def reload(cls, changedFiles: List[str] = None):
+        """
+        Re-initializes the class after its recipe.toml or templates changed, discarding only its cached data.
+        :param changedFiles: The files that changed, if known.
+        :type changedFiles: List[str]
+        """
+        RecipeTomlCache.invalidate(cls.recipe_toml_file())
+        cls.initialize()
+        with FlakeRecipe._reload_listeners_lock:
+            refs = list(FlakeRecipe._reload_listeners)
+        for ref in refs:
+            listener = ref()
+            if listener is None:
+                with FlakeRecipe._reload_listeners_lock:
+                    if ref in FlakeRecipe._reload_listeners:
+                        FlakeRecipe._reload_listeners.remove(ref)
+            else:
+                listener(cls, changedFiles or [])
+
+    @classmethod
+    def add_reload_listener(cls, listener):
+        """
+        Registers a callback to discard the cached data of recipe classes when they get reloaded.
+        Bound methods are held through weak references, so registering them does not keep their instances alive.
+        :param listener: The callback. It receives the recipe class and the list of changed files.
+        :type listener: Callable[[type, List[str]], None]
+        """
+        ref = weakref.WeakMethod(listener) if inspect.ismethod(listener) else (lambda: listener)
+        with FlakeRecipe._reload_listeners_lock:
+            FlakeRecipe._reload_listeners.append(ref)
+
+    @classmethod
+    def remove_reload_listener(cls, listener):
+        """
+        Unregisters a callback added with add_reload_listener().
+        :param listener: The callback.
+        :type listener: Callable[[type, List[str]], None]
+        """
+        with FlakeRecipe._reload_listeners_lock:
+            FlakeRecipe._reload_listeners[:] = [ ref for ref in FlakeRecipe._reload_listeners if ref() not in (None, listener) ]
+
+    @classmethod
+    def initialization_lock(cls) -> threading.RLock:
+        """
+        Retrieves the lock guarding the initialization of this class.
+        :return: Such lock.
+        :rtype: threading.RLock
+        """
+        result = FlakeRecipe._initialization_locks.get(cls, None)
+        if result is None:
+            with FlakeRecipe._initialization_locks_lock:
+                result = FlakeRecipe._initialization_locks.setdefault(cls, threading.RLock())
+        return result
+
+    @classmethod
+    def ensure_initialized(cls):
+        """
+        Initializes the class unless it's already initialized.
+        Concurrent callers, from threads or asyncio tasks, initialize each class exactly once.
+        """
+        if not cls.__dict__.get("_initialized", False):
+            with cls.initialization_lock():
+                if not cls.__dict__.get("_initialized", False):
+                    cls.initialize()
+
+    @classmethod
+    def warm_up(cls, recipeClasses: List, maxWorkers: int = None) -> int:
+        """
+        Initializes given recipe classes eagerly, in parallel.
+        :param recipeClasses: The recipe classes.
+        :type recipeClasses: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        :param maxWorkers: The maximum number of threads.
+        :type maxWorkers: int
+        :return: The number of classes initialized.
+        :rtype: int
+        """
+        pending = [ recipeClass for recipeClass in recipeClasses if recipeClass.should_initialize() ]
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            list(executor.map(lambda recipeClass: recipeClass.ensure_initialized(), pending))
+        return len(pending)
+
+    @classmethod
+    def fingerprint(cls, flake: Flake) -> Tuple[str, str, str]:
+        """
+        Retrieves what identifies given flake when matching it against recipes.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :return: The flake name, version and type.
+        :rtype: Tuple[str, str, str]
+        """
+        pythonPackage = flake.python_package
+        return (flake.name, flake.version, pythonPackage.get_type() if pythonPackage else None)
+
+    @classmethod
+    def match_cache(cls) -> LruCache:
+        """
+        Retrieves the memo of the best recipe class for each flake fingerprint.
+        :return: Such cache.
+        :rtype: LruCache from pythonedanixflakes.recipe.lru_cache
+        """
+        return FlakeRecipe._match_cache
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Dict]:
+        """
+        Retrieves the statistics of the similarity and recipe lookup memos.
+        :return: Such statistics, indexed by memo.
+        :rtype: Dict[str, Dict]
+        """
+        return { "similarity": FlakeRecipe._similarity_cache.stats(), "match": FlakeRecipe._match_cache.stats() }
+
+    @classmethod
+    def use_manifest(cls, manifest):
+        """
+        Specifies the recipe manifest to initialize recipe classes from.
+        :param manifest: The manifest, or None to always inspect the recipe sources.
+        :type manifest: RecipeManifest from pythonedanixflakes.recipe.recipe_manifest
+        """
+        FlakeRecipe._manifest = manifest
 
     @classmethod
     def should_initialize(cls) -> bool:
@@ -96,23 +247,31 @@ class FlakeRecipe(Entity, abc.ABC):
         :return: Such path.
         :rtype: str
         """
-        recipe_folder = Path(inspect.getsourcefile(cls)).parent
-        return os.path.join(recipe_folder, "recipe.toml")
+        if FlakeRecipe._manifest:
+            result = FlakeRecipe._manifest.recipe_toml_file_for(cls)
+            if result and os.path.exists(result):
+                return result
+        return os.path.join(cls.recipe_folder(), "recipe.toml")
+
+    @classmethod
+    def recipe_folder(cls) -> str:
+        """
+        Retrieves the folder of the recipe, including its recipe.toml and templates.
+        :return: Such folder.
+        :rtype: str
+        """
+        return str(Path(inspect.getsourcefile(cls)).parent)
 
     @classmethod
     def read_recipe_toml(cls):
         """
         Reads the recipe.toml file.
+        The parsed contents are shared through RecipeTomlCache, so they must not be modified.
         """
-        result = ""
         recipe_toml_file = cls.recipe_toml_file()
         if not os.path.exists(recipe_toml_file):
             raise MissingRecipeToml(recipe_toml_file)
-        recipe_toml_contents = ""
-        with open(recipe_toml_file, "r") as file:
-            recipe_toml_contents = file.read()
-        result = toml.loads(recipe_toml_contents)
-        return result
+        return RecipeTomlCache.read(recipe_toml_file)
 
     @classmethod
     def supported_flakes(cls) -> List[Dict[str, str]]:
@@ -154,7 +313,7 @@ class FlakeRecipe(Entity, abc.ABC):
                 raise MissingTypeInFlakeMetadataSectionInRecipeToml(cls.recipe_toml_file())
         return result
 
-    @abstractmethod
+    @abc.abstractmethod
     def process(self): # -> FlakeCreated:
         """
         Performs the recipe tasks.
@@ -167,14 +326,14 @@ class FlakeRecipe(Entity, abc.ABC):
     def compatible_versions(cls, v1: str, v2: str) -> bool:
         """
         Checks if given versions are compatible.
-        :param v1: One version.
+        :param v1: The version spec, as found in recipe.toml (i.e. "1.2.*", ">=1.0,<2.0" or "~=1.4").
         :type v1: str
-        :param v2: The other version.
+        :param v2: The version to check.
         :type v2: str
         :return: True if they are compatible.
         :rtype: bool
         """
-        raise NotImplementedError()
+        return VersionSpec.parse(v1).contains(v2)
 
     @classmethod
     def supports(cls, flake: flake) -> bool:
@@ -202,6 +361,41 @@ class FlakeRecipe(Entity, abc.ABC):
     def similarity(cls, flake: Flake) -> float:
         """
         Figures out the similarity of this recipe to given flake.
+        Scores are memoized by flake fingerprint, unless the class overrides supports(), since it can check other flake attributes.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :return: A similarity value between 0.0 and 1.0
+        :rtype: float
+        """
+        if RecipeIndex.overrides(cls, "supports"):
+            return cls.compute_similarity(flake)
+        key = (cls, cls.fingerprint(flake))
+        result = FlakeRecipe._similarity_cache.get(key)
+        if result is None:
+            result = cls.compute_similarity(flake)
+            FlakeRecipe._similarity_cache.put(key, result)
+        return result
+
+    @classmethod
+    def most_similar(cls, recipeClasses: List, flake: Flake):
+        """
+        Retrieves the recipe class most similar to given flake, scoring each of given classes.
+        Ties are broken by the order of the classes.
+        :param recipeClasses: The recipe classes.
+        :type recipeClasses: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :return: The recipe class, or None if no recipe matches.
+        :rtype: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
+        """
+        similarities = { recipeClass: recipeClass.similarity(flake) for recipeClass in recipeClasses }
+        matches = sorted([ aux for aux in similarities.keys() if similarities[aux] != 0.0 ], key=lambda recipeClass: similarities[recipeClass], reverse=True)
+        return matches[0] if matches else None
+
+    @classmethod
+    def compute_similarity(cls, flake: Flake) -> float:
+        """
+        Figures out the similarity of this recipe to given flake, without using the memo.
         :param flake: The flake.
         :type flake: Flake from pythonedanixflakes.flake
         :return: A similarity value between 0.0 and 1.0
@@ -218,7 +412,7 @@ class FlakeRecipe(Entity, abc.ABC):
             name = list(entry.keys())[0]
             version = entry[name]
             if name == flake.name:
-                if version == flake.version:
+                if version == flake.version or VersionSpec.parse(version).is_exact(flake.version):
                     return 1.0
                 elif cls.compatible_versions(version, flake.version):
                     partialResult = 0.9
@@ -226,7 +420,9 @@ class FlakeRecipe(Entity, abc.ABC):
                     partialResult = 0.7
             partialResults.append(partialResult)
         result = max(partialResults)
-        logging.getLogger(cls.__name__).debug(f'Similarity between recipe {cls.__name__} and flake {flake.name}-{flake.version}: {result}')
+        logger = logging.getLogger(cls.__name__)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'Similarity between recipe {cls.__name__} and flake {flake.name}-{flake.version}: {result}')
         return result
 
     def uses_git_repo_sha256(self) -> bool:
@@ -247,15 +443,10 @@ class FlakeRecipe(Entity, abc.ABC):
 
     def remove_duplicates(self, *lists) -> List:
         """
-        Removes duplicates in given list.
-        :param list: The list.
-        :type list: List
+        Removes duplicates in given lists, keeping the first occurrence of each item.
+        :param lists: The lists.
+        :type lists: List
         :return: The trimmed list.
         :rtype: List
         """
-        result = []
-        for lst in lists:
-            for item in lst:
-                if item not in result:
-                    result.append(item)
-        return result
+        return OrderedDeduplication.remove_duplicates(*lists)
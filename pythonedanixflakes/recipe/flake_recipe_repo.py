@@ -21,6 +21,8 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from pythoneda.repo import Repo
 from pythonedanixflakes.flake import Flake
 from pythonedanixflakes.recipe.flake_recipe import FlakeRecipe
+from pythonedanixflakes.recipe.recipe_index import RecipeIndex
+from pythonedanixflakes.recipe.recipe_manifest import RecipeManifest
 
 import abc
 from typing import List
@@ -43,6 +45,8 @@ class FlakeRecipeRepo(Repo, abc.ABC):
         Creates a new FlakeRecipeRepo instance.
         """
         super().__init__(FlakeRecipe)
+        self._recipe_index = None
+        FlakeRecipe.add_reload_listener(self.recipe_reloaded)
 
     @abc.abstractmethod
     def find_recipe_classes_by_flake(self, flake: Flake) -> List[FlakeRecipe]:
@@ -56,3 +60,118 @@ class FlakeRecipeRepo(Repo, abc.ABC):
         raise NotImplementedError(
             "find_recipe_classes_by_flake() must be implemented by subclasses"
         )
+
+    def find_all_recipe_classes(self) -> List[FlakeRecipe]:
+        """
+        Retrieves all available recipe classes, to build the recipe index.
+        Subclasses not overriding it fall back to scoring the classes returned by find_recipe_classes_by_flake().
+        :return: The recipe classes.
+        :rtype: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        """
+        raise NotImplementedError(
+            "find_all_recipe_classes() must be implemented by subclasses"
+        )
+
+    def recipe_index(self) -> RecipeIndex:
+        """
+        Retrieves the index of all recipe classes, building it the first time.
+        :return: The index, or None if the subclass cannot list all recipe classes.
+        :rtype: RecipeIndex from pythonedanixflakes.recipe.recipe_index
+        """
+        if self._recipe_index is None:
+            try:
+                recipeClasses = self.find_all_recipe_classes()
+            except NotImplementedError:
+                return None
+            self._recipe_index = RecipeIndex(recipeClasses)
+        return self._recipe_index
+
+    def warm_up(self, maxWorkers: int = None) -> int:
+        """
+        Initializes all recipe classes eagerly, in parallel, instead of on first use.
+        :param maxWorkers: The maximum number of threads.
+        :type maxWorkers: int
+        :return: The number of classes initialized.
+        :rtype: int
+        """
+        return FlakeRecipe.warm_up(self.find_all_recipe_classes(), maxWorkers)
+
+    def recipe_reloaded(self, recipeClass, changedFiles: List[str]):
+        """
+        Discards the recipe index after a recipe class got reloaded.
+        :param recipeClass: The recipe class.
+        :type recipeClass: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
+        :param changedFiles: The files that changed.
+        :type changedFiles: List[str]
+        """
+        self.invalidate_recipe_index()
+
+    def invalidate_recipe_index(self):
+        """
+        Discards the recipe index, so it gets rebuilt on next use.
+        """
+        self._recipe_index = None
+        FlakeRecipe.match_cache().clear()
+
+    def find_best_recipe_class_by_flake(self, flake: Flake) -> FlakeRecipe:
+        """
+        Retrieves the recipe class most similar to given flake.
+        The result is memoized by flake fingerprint, unless a recipe class overrides supports(),
+        since it can check other flake attributes.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :return: The recipe class, or None if no recipe matches.
+        :rtype: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
+        """
+        index = self.recipe_index()
+        if index is None:
+            return FlakeRecipe.most_similar(self.find_recipe_classes_by_flake(flake), flake)
+        if index.custom_supports:
+            return index.best_match(flake)
+        cache = FlakeRecipe.match_cache()
+        key = FlakeRecipe.fingerprint(flake)
+        result = cache.get(key, cache)
+        if result is cache:
+            result = index.best_match(flake)
+            cache.put(key, result)
+        return result
+
+    def load_manifest(self, path: str) -> RecipeManifest:
+        """
+        Loads the recipe manifest from given file, and uses it to initialize recipe classes.
+        :param path: The manifest file.
+        :type path: str
+        :return: The manifest.
+        :rtype: RecipeManifest from pythonedanixflakes.recipe.recipe_manifest
+        """
+        result = RecipeManifest.load(path)
+        FlakeRecipe.use_manifest(result)
+        return result
+
+    def refresh_manifest(self, recipeClasses: List[FlakeRecipe], path: str) -> RecipeManifest:
+        """
+        Loads the recipe manifest from given file, rescans the stale entries of given recipe classes,
+        writes it back if needed, and uses it to initialize recipe classes.
+        :param recipeClasses: The recipe classes.
+        :type recipeClasses: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        :param path: The manifest file.
+        :type path: str
+        :return: The manifest.
+        :rtype: RecipeManifest from pythonedanixflakes.recipe.recipe_manifest
+        """
+        result = self.load_manifest(path)
+        result.refresh(recipeClasses)
+        return result
+
+    def find_best_recipe_classes_by_flakes(self, flakes: List[Flake]) -> List[FlakeRecipe]:
+        """
+        Retrieves the recipe class most similar to each of given flakes, at once.
+        :param flakes: The flakes.
+        :type flakes: List[Flake from pythonedanixflakes.flake]
+        :return: The recipe class for each flake (or None), in the same order.
+        :rtype: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        """
+        index = self.recipe_index()
+        if index is None:
+            return [ self.find_best_recipe_class_by_flake(flake) for flake in flakes ]
+        return index.best_matches(flakes)
@@ -22,6 +22,8 @@ from pythoneda.formatting import Formatting
 from pythonedanixflakes.flake import Flake
 from pythonedanixflakes.flake.license import License
 
+from typing import Tuple
+
 class FormattedFlake(Formatting):
     """
     Augments Flake class to include formatting logic required by recipe templates.
@@ -42,6 +44,8 @@ class FormattedFlake(Formatting):
         :type flake: Flake from pythonedanixflakes.flake
         """
         super().__init__(flk)
+        self._license = None
+        self._repo_owner_and_repo_name = None
 
     @property
     def flake(self) -> Flake:
@@ -74,7 +78,9 @@ class FormattedFlake(Formatting):
         :return: Such information.
         :rtype str:
         """
-        return License.from_pypi(self.flake.python_package.info.get("license", "")).nix
+        if self._license is None:
+            self._license = License.from_pypi(self.flake.python_package.info.get("license", "")).nix
+        return self._license
 
     def sha256(self) -> str:
         """
@@ -106,16 +112,26 @@ class FormattedFlake(Formatting):
             result = self.flake.python_package.git_repo.rev
         return result
 
+    def repo_owner_and_repo_name(self) -> Tuple[str, str]:
+        """
+        Retrieves the owner and the name of the repository, parsing them only once.
+        :return: Such information.
+        :rtype: Tuple[str, str]
+        """
+        if self._repo_owner_and_repo_name is None:
+            result = ("", "")
+            if self.flake.python_package.git_repo:
+                result = tuple(self.flake.python_package.git_repo.repo_owner_and_repo_name())
+            self._repo_owner_and_repo_name = result
+        return self._repo_owner_and_repo_name
+
     def repo_owner(self) -> str:
         """
         Retrieves the owner of the repository.
         :return: Such information.
         :rtype: str
         """
-        result = ""
-        if self.flake.python_package.git_repo:
-            result, _ = self.flake.python_package.git_repo.repo_owner_and_repo_name()
-        return result
+        return self.repo_owner_and_repo_name()[0]
 
     def repo_name(self):
         """
@@ -123,7 +139,4 @@ class FormattedFlake(Formatting):
         :return: Such information.
         :rtype: str
         """
-        result = ""
-        if self.flake.python_package.git_repo:
-            _, result = self.flake.python_package.git_repo.repo_owner_and_repo_name()
-        return result
+        return self.repo_owner_and_repo_name()[1]
@@ -48,7 +48,7 @@ class FormattedFlakePythonPackage(FormattedPythonPackage):
         :return: Such declaration.
         :rtype: str
         """
-        return f'{self._formatted.name}-flake.url = "{self._formatted.flake_url()}";'
+        return self.output("flake_declaration", lambda: f'{self._formatted.name}-flake.url = "{self._formatted.flake_url()}";')
 
     def as_parameter_to_package_nix(self) -> str:
         """
@@ -56,4 +56,4 @@ class FormattedFlakePythonPackage(FormattedPythonPackage):
         :return: Such subtemplate.
         :rtype: str
         """
-        return f"{self._formatted.name} = {self._formatted.name}-flake.packages.${{system}}.{self._formatted.name};"
+        return self.output("as_parameter_to_package_nix", lambda: f"{self._formatted.name} = {self._formatted.name}-flake.packages.${{system}}.{self._formatted.name};")
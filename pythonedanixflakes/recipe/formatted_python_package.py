@@ -19,9 +19,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from pythoneda.formatting import Formatting
+from pythonedanixflakes.recipe.ordered_deduplication import OrderedDeduplication
 from pythonedasharedpythonpackages.python_package import PythonPackage
 
 import abc
+from typing import Callable, Tuple
 
 class FormattedPythonPackage(Formatting, abc.ABC):
     """
@@ -42,6 +44,7 @@ class FormattedPythonPackage(Formatting, abc.ABC):
         :type pkg: PythonPackage from pythonedasharedpythonpackages.python_package
         """
         super().__init__(pkg)
+        self._outputs = {}
 
     @property
     def pkg(self) -> PythonPackage:
@@ -52,6 +55,30 @@ class FormattedPythonPackage(Formatting, abc.ABC):
         """
         return self._fmt
 
+    def output(self, name: str, builder: Callable[[], str]) -> str:
+        """
+        Retrieves an output of this package, building it only the first time, since instances get shared (see FormattedPythonPackagePool).
+        :param name: The name of the output.
+        :type name: str
+        :param builder: The function building it.
+        :type builder: Callable[[], str]
+        :return: The output.
+        :rtype: str
+        """
+        result = self._outputs.get(name, None)
+        if result is None:
+            result = builder()
+            self._outputs[name] = result
+        return result
+
+    def dedup_key(self) -> Tuple[str, str]:
+        """
+        Retrieves the key identifying this package when removing duplicates.
+        :return: The normalized name and the version.
+        :rtype: Tuple[str, str]
+        """
+        return (OrderedDeduplication.normalize_name(self._formatted.name), self._formatted.version)
+
     @abc.abstractmethod
     def as_parameter_to_package_nix() -> str:
         """
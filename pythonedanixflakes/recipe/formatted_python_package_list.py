@@ -21,7 +21,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from pythoneda.formatting import Formatting
 from pythonedanixflakes.recipe.formatted_python_package import FormattedPythonPackage
 
-from typing import Callable, List
+import inspect
+import operator
+from typing import Callable, List, Sequence
 
 class FormattedPythonPackageList(Formatting):
     """
@@ -31,16 +33,22 @@ class FormattedPythonPackageList(Formatting):
 
     Responsibilities:
         - Augment a list of PythonPackages to include formatting logic required by recipe templates.
+        - Share the same immutable packages among all the lists derived from it (see the with_* methods),
+          copying them only when the list gets modified (e.g. append() or sort()).
 
     Collaborators:
         - FormattedPythonPackage
     """
 
+    _accessors = {}
+
+    _mutators = frozenset([ "append", "clear", "extend", "insert", "pop", "remove", "reverse", "sort" ])
+
     def __init__(self, lst: List[FormattedPythonPackage], f: str = "__str__", indent: str = "", separator: str = "", initialPrefix: str = "", finalSuffix: str = ""):
         """
         Creates a new instance.
-        :param lst: The list of Python packages.
-        :type lst: List[FormattedPythonPackage from pythonedanixflakes.recipe.formatted_python_package]
+        :param lst: The list of Python packages. Tuples are shared as they are; other iterables are copied into a tuple.
+        :type lst: Iterable[FormattedPythonPackage from pythonedanixflakes.recipe.formatted_python_package]
         :param f: The function name.
         :type f: str
         :param indent: The indentation text.
@@ -52,21 +60,33 @@ class FormattedPythonPackageList(Formatting):
         :param finalSuffix: The final suffix.
         :type finalSuffix: str
         """
-        super().__init__(lst)
+        items = lst if isinstance(lst, tuple) else tuple(lst)
+        super().__init__(items)
+        self._items = items
         self._func_name = f
         self._indent = indent
         self._separator = separator
         self._initial_prefix = initialPrefix
         self._final_suffix = finalSuffix
+        self._rendered = None
 
     @property
     def list(self) -> List[FormattedPythonPackage]:
         """
         Retrieves the list of Python packages.
-        :return: Such list.
+        :return: A copy of such list. Changing it does not change this instance.
         :rtype: List[FormattedPythonPackage from pythonedanixflakes.recipe.formatted_python_package]
         """
-        return self._fmt
+        return list(self._items)
+
+    @property
+    def items(self) -> Sequence[FormattedPythonPackage]:
+        """
+        Retrieves the Python packages, without copying them.
+        :return: Such packages: the shared tuple, or the list owned by this instance once modified. Callers must not modify it.
+        :rtype: Sequence[FormattedPythonPackage from pythonedanixflakes.recipe.formatted_python_package]
+        """
+        return self._items
 
     @property
     def func_name(self) -> str:
@@ -118,50 +138,60 @@ class FormattedPythonPackageList(Formatting):
         Builds another list with a different function name.
         :param value: The function name.
         :type value: str
-        :return: The new list.
+        :return: A list sharing the same packages, or this one if the value does not change.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.list, value, self._indent, self._separator, self._initial_prefix, self._final_suffix)
+        if value == self._func_name:
+            return self
+        return FormattedPythonPackageList(self._items, value, self._indent, self._separator, self._initial_prefix, self._final_suffix)
 
     def with_indentation(self, value: str) :#-> FormattedPythonPackageList:
         """
         Builds another list with a different indentation.
         :param value: The indentation.
         :type value: str
-        :return: The new list.
+        :return: A list sharing the same packages, or this one if the value does not change.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.list, self._func_name, value, self._separator, self._initial_prefix, self._final_suffix)
+        if value == self._indent:
+            return self
+        return FormattedPythonPackageList(self._items, self._func_name, value, self._separator, self._initial_prefix, self._final_suffix)
 
     def with_separator(self, value: str) :#-> FormattedPythonPackageList:
         """
         Builds another list with a different separator.
         :param value: The separator.
         :type value: str
-        :return: The new list.
+        :return: A list sharing the same packages, or this one if the value does not change.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.list, self._func_name, self._indent, value, self._initial_prefix, self._final_suffix)
+        if value == self._separator:
+            return self
+        return FormattedPythonPackageList(self._items, self._func_name, self._indent, value, self._initial_prefix, self._final_suffix)
 
     def with_initial_prefix(self, value: str) :#-> FormattedPythonPackageList:
         """
         Builds another list with a different initial prefix.
         :param value: The prefix.
         :type value: str
-        :return: The new list.
+        :return: A list sharing the same packages, or this one if the value does not change.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.list, self._func_name, self._indent, self._separator, value, self._final_suffix)
+        if value == self._initial_prefix:
+            return self
+        return FormattedPythonPackageList(self._items, self._func_name, self._indent, self._separator, value, self._final_suffix)
 
     def with_final_suffix(self, value: str) :#-> FormattedPythonPackageList:
         """
         Builds another list with a different final suffix.
         :param value: The suffix.
         :type value: str
-        :return: The new list.
+        :return: A list sharing the same packages, or this one if the value does not change.
         :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
         """
-        return FormattedPythonPackageList(self.list, self._func_name, self._indent, self._separator, self._initial_prefix, value)
+        if value == self._final_suffix:
+            return self
+        return FormattedPythonPackageList(self._items, self._func_name, self._indent, self._separator, self._initial_prefix, value)
 
     def _invoke_func(self, dep: FormattedPythonPackage) -> str:
         """
@@ -171,35 +201,79 @@ class FormattedPythonPackageList(Formatting):
         :return: The function output.
         :rtype: str
         """
-        result = ""
-
-        func = getattr(dep, self.func_name)
-
-        if callable(func):
-            result = func()
-        else:
-            result = func
+        return self.__class__.accessor_for(dep.__class__, self._func_name)(dep)
 
+    @classmethod
+    def accessor_for(cls, elementClass: type, funcName: str) -> Callable:
+        """
+        Retrieves the function providing the output of given function name for the elements of given class, resolving it only once.
+        :param elementClass: The class of the elements.
+        :type elementClass: type
+        :param funcName: The function name.
+        :type funcName: str
+        :return: A function receiving the element and returning the output.
+        :rtype: Callable
+        """
+        key = (elementClass, funcName)
+        result = FormattedPythonPackageList._accessors.get(key, None)
+        if result is None:
+            attribute = inspect.getattr_static(elementClass, funcName, None)
+            if isinstance(attribute, property):
+                result = operator.attrgetter(funcName)
+            elif inspect.isroutine(attribute) or isinstance(attribute, (classmethod, staticmethod)):
+                result = operator.methodcaller(funcName)
+            else:
+                # not declared by the class itself (e.g. delegated to the wrapped package): check each element
+                def result(dep):
+                    func = getattr(dep, funcName)
+                    return func() if callable(func) else func
+            FormattedPythonPackageList._accessors[key] = result
         return result
 
     def __str__(self) -> str:
         """
-        Provides a string representation of the list.
+        Provides a string representation of the list, building it only the first time.
         :return: Such text.
         :rtype: str
         """
-        result = ""
-        if len(self.list) > 0:
-            result = f'{self.initial_prefix}{self.separator.join([f"{self.indent}{self._invoke_func(dep)}" for dep in self.list])}{self.final_suffix}'
-
-        return result
+        if self._rendered is None:
+            result = ""
+            if len(self._items) > 0:
+                accessors = {}
+                texts = []
+                for dep in self._items:
+                    accessor = accessors.get(dep.__class__, None)
+                    if accessor is None:
+                        accessor = self.__class__.accessor_for(dep.__class__, self._func_name)
+                        accessors[dep.__class__] = accessor
+                    texts.append(f'{self._indent}{accessor(dep)}')
+                result = f'{self._initial_prefix}{self._separator.join(texts)}{self._final_suffix}'
+            self._rendered = result
+        return self._rendered
 
     def __getattr__(self, attr):
         """
-        Delegates any method call to the wrapped instance.
+        Delegates any method call to the wrapped list.
+        Methods modifying it (see _mutators) work on a copy of the shared packages, owned by this instance.
         :param attr: The attribute.
         :type attr: Any
         :return: The attribute value.
         :rtype: Any
         """
-        return getattr(self.list, attr)
+        if attr.startswith("_"):
+            # private attributes missing (e.g. while unpickling) must not recurse through self._items
+            raise AttributeError(attr)
+        if attr not in FormattedPythonPackageList._mutators:
+            return getattr(self._items, attr)
+        if isinstance(self._items, tuple):
+            self._items = list(self._items)
+            # Formatting wraps the packages too: keep it on the same list
+            self._fmt = self._items
+        method = getattr(self._items, attr)
+
+        def mutate(*args, **kwargs):
+            result = method(*args, **kwargs)
+            self._rendered = None
+            return result
+
+        return mutate
@@ -0,0 +1,98 @@
+"""
+pythonedanixflakes/recipe/formatted_python_package_pool.py
+
+This file defines the FormattedPythonPackagePool class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.lru_cache import LruCache
+
+from typing import Any, Dict
+
+class FormattedPythonPackagePool():
+    """
+    Process-wide pool of formatted Python packages, shared by all flakes depending on the same packages.
+
+    Class name: FormattedPythonPackagePool
+
+    Responsibilities:
+        - Return the same formatted instance for the same package name, version and kind of formatting.
+          Names are not normalized, so each flake renders its dependencies as it spells them.
+        - Keep at most a fixed number of instances, evicting the least recently used ones.
+
+    Collaborators:
+        - BaseFlakeRecipe: Formats the dependencies of its flake through the pool.
+        - FormattedPythonPackage: The pooled instances, which memoize their outputs.
+        - LruCache: Bounds the pool.
+    """
+
+    _pool = LruCache(8192)
+
+    @classmethod
+    def key_for(cls, kind: type, pkg) -> tuple:
+        """
+        Retrieves the key of given package in the pool.
+        :param kind: The formatting class.
+        :type kind: type
+        :param pkg: The Python package.
+        :type pkg: PythonPackage from pythonedasharedpythonpackages.python_package
+        :return: The name, as given, the version and the formatting class.
+        :rtype: tuple
+        """
+        return (pkg.name, pkg.version, kind)
+
+    @classmethod
+    def get(cls, kind: type, pkg):
+        """
+        Retrieves the formatted instance of given package, creating it unless it's pooled already.
+        :param kind: The formatting class, e.g. FormattedNixpkgsPythonPackage.
+        :type kind: type
+        :param pkg: The Python package.
+        :type pkg: PythonPackage from pythonedasharedpythonpackages.python_package
+        :return: The formatted package. It's shared, so callers must not modify it.
+        :rtype: FormattedPythonPackage from pythonedanixflakes.recipe.formatted_python_package
+        """
+        key = cls.key_for(kind, pkg)
+        result = cls._pool.get(key, None)
+        if result is None:
+            result = kind(pkg)
+            cls._pool.put(key, result)
+        return result
+
+    @classmethod
+    def resize(cls, maxSize: int):
+        """
+        Specifies the maximum number of pooled instances, discarding the current ones.
+        :param maxSize: Such number.
+        :type maxSize: int
+        """
+        cls._pool = LruCache(maxSize)
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards all pooled instances.
+        """
+        cls._pool.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """
+        Retrieves the pool statistics.
+        :return: The hits, misses, hit rate, size and maximum size.
+        :rtype: Dict[str, Any]
+        """
+        return cls._pool.stats()
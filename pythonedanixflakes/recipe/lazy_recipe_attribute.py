@@ -0,0 +1,71 @@
+"""
+pythonedanixflakes/recipe/lazy_recipe_attribute.py
+
+This file defines the LazyRecipeAttribute class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+
+class LazyRecipeAttribute():
+    """
+    Class attribute of recipe classes whose value is loaded on first access.
+
+    Class name: LazyRecipeAttribute
+
+    Responsibilities:
+        - Initialize the recipe class the first time the attribute is read, either from the class or an instance.
+        - Return the value the class stored when it was initialized.
+
+    Collaborators:
+        - FlakeRecipe: Declares _flakes and _type as lazy attributes, and stores their values on initialization.
+    """
+
+    def __init__(self, storage: str, default: Any = None):
+        """
+        Creates a new LazyRecipeAttribute instance.
+        :param storage: The name of the class attribute holding the loaded value.
+        :type storage: str
+        :param default: The value for classes which don't need initialization.
+        :type default: Any
+        """
+        super().__init__()
+        self._storage = storage
+        self._default = default
+
+    @property
+    def storage(self) -> str:
+        """
+        Retrieves the name of the class attribute holding the loaded value.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._storage
+
+    def __get__(self, instance, owner) -> Any:
+        """
+        Retrieves the value of the attribute, initializing the recipe class if needed.
+        :param instance: The recipe instance, or None if accessed from the class.
+        :type instance: FlakeRecipe from pythonedanixflakes.recipe.flake_recipe
+        :param owner: The recipe class.
+        :type owner: type
+        :return: The attribute value.
+        :rtype: Any
+        """
+        if owner.should_initialize():
+            owner.ensure_initialized()
+            return owner.__dict__.get(self._storage, self._default)
+        return self._default
@@ -0,0 +1,97 @@
+"""
+pythonedanixflakes/recipe/lazy_subtemplates.py
+
+This file defines the LazySubtemplates class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any, Callable, Dict
+
+class LazySubtemplates():
+    """
+    Dependency subtemplates of one input category, computed on first use.
+
+    Class name: LazySubtemplates
+
+    Responsibilities:
+        - Build each subtemplate kind only when a template asks for it, and only once.
+        - Behave like the dictionary BaseFlakeRecipe.extract_dep_templates() returns.
+
+    Collaborators:
+        - BaseFlakeRecipe: Builds each subtemplate kind.
+    """
+
+    def __init__(self, builder: Callable[[Any, Any, Any], Any], inputs):
+        """
+        Creates a new LazySubtemplates instance.
+        :param builder: The function building a subtemplate kind, given the inputs, the kind and this instance.
+        :type builder: Callable[[Any, Any, LazySubtemplates], Any]
+        :param inputs: The Python packages (as the builder expects them), or a function retrieving them.
+        :type inputs: Any or Callable[[], Any]
+        """
+        super().__init__()
+        self._builder = builder
+        self._inputs = inputs
+        self._subtemplates = {}
+
+    @property
+    def inputs(self) -> Any:
+        """
+        Retrieves the Python packages.
+        :return: Such packages.
+        :rtype: Any
+        """
+        if callable(self._inputs):
+            self._inputs = self._inputs()
+        return self._inputs
+
+    def get(self, kind, default: Any = None) -> Any:
+        """
+        Retrieves the subtemplate of given kind, building it the first time.
+        :param kind: The kind of subtemplate.
+        :type kind: BaseFlakeRecipe.Subtemplates from pythonedanixflakes.recipe.base_flake_recipe
+        :param default: The value to return if the kind is not supported.
+        :type default: Any
+        :return: The subtemplate.
+        :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
+        """
+        if kind not in self._subtemplates:
+            result = self._builder(self.inputs, kind, self)
+            if result is None:
+                return default
+            self._subtemplates[kind] = result
+        return self._subtemplates[kind]
+
+    def __getitem__(self, kind) -> Any:
+        """
+        Retrieves the subtemplate of given kind, building it the first time.
+        :param kind: The kind of subtemplate.
+        :type kind: BaseFlakeRecipe.Subtemplates from pythonedanixflakes.recipe.base_flake_recipe
+        :return: The subtemplate.
+        :rtype: FormattedPythonPackageList from pythonedanixflakes.recipe.formatted_python_package_list
+        """
+        result = self.get(kind)
+        if result is None:
+            raise KeyError(kind)
+        return result
+
+    def computed(self) -> Dict:
+        """
+        Retrieves the subtemplates built so far.
+        :return: Such subtemplates, indexed by kind.
+        :rtype: Dict
+        """
+        return dict(self._subtemplates)
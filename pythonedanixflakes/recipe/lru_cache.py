@@ -0,0 +1,136 @@
+"""
+pythonedanixflakes/recipe/lru_cache.py
+
+This file defines the LruCache class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class LruCache():
+    """
+    Bounded, thread-safe memo which evicts the least recently used entries.
+
+    Class name: LruCache
+
+    Responsibilities:
+        - Remember values up to a maximum number of entries.
+        - Keep hit/miss statistics.
+
+    Collaborators:
+        - FlakeRecipe: Memoizes similarity scores and recipe lookups.
+        - VersionSpec: Memoizes parsed specs and versions.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxSize: int = 4096):
+        """
+        Creates a new LruCache instance.
+        :param maxSize: The maximum number of entries.
+        :type maxSize: int
+        """
+        super().__init__()
+        self._max_size = maxSize
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """
+        Retrieves the maximum number of entries.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._max_size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieves the value associated to given key.
+        :param key: The key.
+        :type key: Hashable
+        :param default: The value to return if the key is not cached.
+        :type default: Any
+        :return: The cached value, or the default.
+        :rtype: Any
+        """
+        with self._lock:
+            result = self._entries.get(key, self.__class__._MISSING)
+            if result is self.__class__._MISSING:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Associates given value to given key, evicting the least recently used entry if the cache is full.
+        :param key: The key.
+        :type key: Hashable
+        :param value: The value.
+        :type value: Any
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def discard_if(self, predicate: Callable[[Hashable], bool]):
+        """
+        Discards the entries whose key satisfies given condition.
+        :param predicate: The condition.
+        :type predicate: Callable[[Hashable], bool]
+        """
+        with self._lock:
+            for key in [ aux for aux in self._entries if predicate(aux) ]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Discards all entries. The statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retrieves the cache statistics.
+        :return: The hits, misses, hit rate, current size and maximum size.
+        :rtype: Dict[str, Any]
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self._max_size
+            }
+
+    def __len__(self) -> int:
+        """
+        Retrieves the number of entries.
+        :return: Such number.
+        :rtype: int
+        """
+        return len(self._entries)
@@ -0,0 +1,127 @@
+"""
+pythonedanixflakes/recipe/nix_template_cache.py
+
+This file defines the NixTemplateCache class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedasharednix.nix_template import NixTemplate
+
+import hashlib
+import threading
+import time
+from typing import Dict
+
+class NixTemplateCache():
+    """
+    Process-wide cache of parsed templates, per recipe class.
+
+    Class name: NixTemplateCache
+
+    Responsibilities:
+        - Parse each template of a recipe class once, as long as its contents don't change.
+        - Replace an entry when the contents of its template change, and drop all entries of a recipe class when it gets reloaded.
+        - Measure the parse time saved by the cache.
+
+    Collaborators:
+        - BaseFlakeRecipe: Retrieves its templates through this cache.
+        - NixTemplate: The parsed templates.
+    """
+
+    _entries = {}
+    _hits = 0
+    _misses = 0
+    _parse_seconds = 0.0
+    _saved_seconds = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def digest(cls, contents: str) -> str:
+        """
+        Retrieves the hash identifying given template contents.
+        :param contents: The template contents.
+        :type contents: str
+        :return: The SHA-256 digest.
+        :rtype: str
+        """
+        return hashlib.sha256(contents.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def template(cls, recipeClass, folder: str, path: str, contents: str) -> NixTemplate:
+        """
+        Retrieves the parsed template, parsing it unless its contents are cached already.
+        :param recipeClass: The recipe class the template belongs to.
+        :type recipeClass: type
+        :param folder: The template folder.
+        :type folder: str
+        :param path: The template path.
+        :type path: str
+        :param contents: The template contents.
+        :type contents: str
+        :return: The template. It's shared, so callers must not modify it.
+        :rtype: NixTemplate from pythonedasharednix.nix_template
+        """
+        key = (recipeClass, folder, path)
+        digest = cls.digest(contents)
+        with cls._lock:
+            entry = cls._entries.get(key, None)
+            if entry and entry[0] == digest:
+                cls._hits += 1
+                cls._saved_seconds += entry[2]
+                return entry[1]
+            cls._misses += 1
+        start = time.perf_counter()
+        result = NixTemplate(folder, path, contents)
+        elapsed = time.perf_counter() - start
+        with cls._lock:
+            cls._parse_seconds += elapsed
+            cls._entries[key] = (digest, result, elapsed)
+        return result
+
+    @classmethod
+    def invalidate(cls, recipeClass = None):
+        """
+        Discards the cached templates of given recipe class, or all of them if no class is provided.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        """
+        with cls._lock:
+            if recipeClass is None:
+                cls._entries.clear()
+            else:
+                for key in [ key for key in cls._entries if key[0] is recipeClass ]:
+                    del cls._entries[key]
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """
+        Retrieves the cache statistics since the last reset_stats() call, e.g. for the current batch.
+        :return: The hits, misses, cached entries, time spent parsing and parse time saved (in seconds).
+        :rtype: Dict
+        """
+        with cls._lock:
+            return { "hits": cls._hits, "misses": cls._misses, "entries": len(cls._entries), "parse_seconds": cls._parse_seconds, "saved_seconds": cls._saved_seconds }
+
+    @classmethod
+    def reset_stats(cls):
+        """
+        Resets the statistics, typically at the start of a batch.
+        """
+        with cls._lock:
+            cls._hits = 0
+            cls._misses = 0
+            cls._parse_seconds = 0.0
+            cls._saved_seconds = 0.0
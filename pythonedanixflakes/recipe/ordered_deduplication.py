@@ -0,0 +1,90 @@
+"""
+pythonedanixflakes/recipe/ordered_deduplication.py
+
+This file defines the OrderedDeduplication class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import re
+from typing import Any, Iterable, List
+
+class OrderedDeduplication():
+    """
+    Removes duplicates from lists in linear time, keeping the first occurrence of each item.
+
+    Class name: OrderedDeduplication
+
+    Responsibilities:
+        - Compare items by their canonical key (see dedup_key()), or by equality if they don't provide one.
+        - Fall back to a linear scan for items whose key is not hashable.
+
+    Collaborators:
+        - FlakeRecipe: Removes duplicated dependencies through this class.
+        - FormattedPythonPackage: Provides the canonical key of formatted packages.
+    """
+
+    _separators = re.compile(r"[-_.]+")
+
+    @classmethod
+    def normalize_name(cls, name: str) -> str:
+        """
+        Normalizes given package name, as PEP 503 does.
+        :param name: The package name.
+        :type name: str
+        :return: The normalized name.
+        :rtype: str
+        """
+        return cls._separators.sub("-", name).lower()
+
+    @classmethod
+    def key_for(cls, item: Any) -> Any:
+        """
+        Retrieves the key used to compare given item.
+        :param item: The item.
+        :type item: Any
+        :return: The value of its dedup_key() method, if any, or the item itself otherwise.
+        :rtype: Any
+        """
+        dedup_key = getattr(item, "dedup_key", None)
+        if dedup_key is None:
+            return item
+        return dedup_key()
+
+    @classmethod
+    def remove_duplicates(cls, *lists: Iterable) -> List:
+        """
+        Concatenates given lists, removing duplicates.
+        :param lists: The lists.
+        :type lists: Iterable
+        :return: The items, in order, without duplicates.
+        :rtype: List
+        """
+        result = []
+        seen = set()
+        unhashable = []
+        for lst in lists:
+            for item in lst:
+                key = cls.key_for(item)
+                try:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                except TypeError:
+                    if key in unhashable:
+                        continue
+                    unhashable.append(key)
+                result.append(item)
+        return result
@@ -0,0 +1,104 @@
+"""
+pythonedanixflakes/recipe/placeholder_dispatch.py
+
+This file defines the PlaceholderDispatch class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.recipe_does_not_support_placeholder import RecipeDoesNotSupportPlaceholder
+
+import inspect
+import re
+from typing import Any, List, Tuple
+
+class PlaceholderDispatch():
+    """
+    Check of the placeholders the templates of a recipe use, before rendering them.
+
+    Class name: PlaceholderDispatch
+
+    Responsibilities:
+        - Find the flake and recipe placeholders the templates reference directly, as in $recipe.declaration$.
+        - Fail if the recipe, or its flake, cannot provide any of them.
+        The check is best-effort: references it cannot see, such as the ones made inside subtemplates,
+        are not checked, but still render, since templates get the flake and the recipe themselves.
+
+    Collaborators:
+        - BaseFlakeRecipe: Validates the placeholders of its templates before rendering them.
+        - FormattedFlake: Provides the flake placeholders, along with the flake it wraps.
+        - RecipeDoesNotSupportPlaceholder: Raised for unknown placeholders.
+    """
+
+    EXPRESSION = re.compile(r"(?<!\\)\$([^$\n]+?)(?<!\\)\$")
+
+    REFERENCE = re.compile(r"\b(flake|recipe)\.([A-Za-z_]\w*)")
+
+    _MISSING = object()
+
+    @classmethod
+    def references(cls, contents: str) -> List[Tuple[str, str]]:
+        """
+        Finds the placeholders used in given template.
+        :param contents: The template contents.
+        :type contents: str
+        :return: The scope ("flake" or "recipe") and name of each placeholder, in order of appearance and without duplicates.
+        :rtype: List[Tuple[str, str]]
+        """
+        result = {}
+        for expression in cls.EXPRESSION.finditer(contents):
+            for reference in cls.REFERENCE.finditer(expression.group(1)):
+                result[(reference.group(1), reference.group(2))] = None
+        return list(result)
+
+    @classmethod
+    def provides(cls, target: Any, name: str) -> bool:
+        """
+        Checks if given object provides given attribute, as templates resolve it.
+        Properties and methods are found without evaluating them; data attributes of the class or the instance,
+        and attributes provided through __getattr__, are found with getattr().
+        :param target: The object.
+        :type target: Any
+        :param name: The attribute.
+        :type name: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        if inspect.getattr_static(target, name, cls._MISSING) is not cls._MISSING:
+            return True
+        return getattr(target, name, cls._MISSING) is not cls._MISSING
+
+    @classmethod
+    def validate(cls, recipe, references: List[Tuple[str, str]]) -> List[str]:
+        """
+        Checks given recipe, and its flake, provide given placeholders.
+        :param recipe: The recipe.
+        :type recipe: BaseFlakeRecipe from pythonedanixflakes.recipe.base_flake_recipe
+        :param references: The scope ("flake" or "recipe") and name of each placeholder (see references()).
+        :type references: List[Tuple[str, str]]
+        :return: The placeholders checked, as in "recipe.declaration".
+        :rtype: List[str]
+        :raise RecipeDoesNotSupportPlaceholder: If any placeholder is not provided.
+        """
+        result = []
+        for scope, name in references:
+            if scope == "flake":
+                provided = cls.provides(recipe.flake, name) or cls.provides(recipe._flake, name)
+            else:
+                provided = cls.provides(recipe, name)
+            if not provided:
+                raise RecipeDoesNotSupportPlaceholder(f'{scope}.{name}', name, recipe.__class__.__name__)
+            result.append(f'{scope}.{name}')
+        return result
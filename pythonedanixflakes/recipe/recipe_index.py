@@ -0,0 +1,238 @@
+"""
+pythonedanixflakes/recipe/recipe_index.py
+
+This file defines the RecipeIndex class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.version_interval_index import VersionIntervalIndex
+from pythonedanixflakes.recipe.version_spec import VersionSpec
+
+from typing import Dict, List, Tuple
+
+class RecipeIndex():
+    """
+    Inverted index of recipe classes, to find the best recipe for a flake without scoring every recipe.
+
+    Class name: RecipeIndex
+
+    Responsibilities:
+        - Index recipe classes by supported flake name, by (name, version) and by flake type.
+        - Keep the entries of each flake name ordered by version, and in a VersionIntervalIndex.
+        - Pick the same recipe FlakeRecipe.similarity would rank first, by probing the index.
+
+    Collaborators:
+        - FlakeRecipe: The indexed classes.
+        - FlakeRecipeRepo: Builds and caches the index.
+    """
+
+    def __init__(self, recipeClasses: List):
+        """
+        Creates a new RecipeIndex instance.
+        :param recipeClasses: The recipe classes. Their order breaks ties, as in FlakeRecipe.most_similar.
+        :type recipeClasses: List[type]
+        """
+        super().__init__()
+        self._recipe_classes = list(recipeClasses)
+        self._order = {}
+        self._by_name = {}
+        self._by_name_and_version = {}
+        self._by_type = {}
+        self._custom_supports = []
+        self._intervals = {}
+        for position, recipeClass in enumerate(self._recipe_classes):
+            self._add(position, recipeClass)
+        for name, entries in self._by_name.items():
+            entries.sort(key=lambda entry: (self.__class__.version_key(entry[0]), entry[1]))
+            self._intervals[name] = VersionIntervalIndex([ (entry[0], entry) for entry in entries if not self.__class__.overrides(entry[2], "compatible_versions") ])
+
+    @property
+    def recipe_classes(self) -> List:
+        """
+        Retrieves the indexed recipe classes.
+        :return: Such classes.
+        :rtype: List[type]
+        """
+        return self._recipe_classes
+
+    @property
+    def custom_supports(self) -> List:
+        """
+        Retrieves the indexed recipe classes overriding supports(), whose matches can depend on any flake attribute.
+        :return: Such classes.
+        :rtype: List[type]
+        """
+        return self._custom_supports
+
+    @classmethod
+    def version_key(cls, spec: str) -> Tuple:
+        """
+        Builds a sort key for given version spec, based on the lowest version it accepts.
+        :param spec: The version spec.
+        :type spec: str
+        :return: The key.
+        :rtype: Tuple
+        """
+        versionSpec = VersionSpec.parse(spec)
+        if versionSpec.literal is not None:
+            return (2, versionSpec.literal)
+        lowers = [ interval.lower for interval in versionSpec.intervals ]
+        if not lowers or None in lowers:
+            return (0, "")
+        return (1, min(lowers))
+
+    @classmethod
+    def overrides(cls, recipeClass, method: str) -> bool:
+        """
+        Checks if given recipe class overrides a method in a concrete recipe.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :param method: The method name.
+        :type method: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        owner = next((aux for aux in recipeClass.__mro__ if method in vars(aux)), None)
+        return owner is not None and owner.should_initialize()
+
+    def _add(self, position: int, recipeClass):
+        """
+        Indexes given recipe class.
+        :param position: The position of the class, used to break ties.
+        :type position: int
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        """
+        self._order[recipeClass] = position
+        if self.__class__.overrides(recipeClass, "supports"):
+            self._custom_supports.append(recipeClass)
+        for entry in recipeClass._flakes:
+            name = list(entry.keys())[0]
+            version = entry[name]
+            self._by_name.setdefault(name, []).append((version, position, recipeClass))
+            self._by_name_and_version.setdefault((name, version), recipeClass)
+        # recipes without a type match flakes without one, as in FlakeRecipe.type_matches
+        self._by_type.setdefault(getattr(recipeClass, "_type", None), []).append(recipeClass)
+
+    def entries_for_name(self, name: str) -> List[Tuple]:
+        """
+        Retrieves the (version, position, recipe class) entries for given flake name, ordered by version.
+        :param name: The flake name.
+        :type name: str
+        :return: Such entries.
+        :rtype: List[Tuple]
+        """
+        return self._by_name.get(name, [])
+
+    def recipe_classes_for_type(self, flakeType: str) -> List:
+        """
+        Retrieves the recipe classes for given flake type.
+        :param flakeType: The flake type, or None for the recipes without a type.
+        :type flakeType: str
+        :return: Such classes.
+        :rtype: List[type]
+        """
+        return self._by_type.get(flakeType, [])
+
+    def _first(self, recipeClasses) -> type:
+        """
+        Retrieves the recipe class which comes first in the original order.
+        :param recipeClasses: The candidate recipe classes.
+        :type recipeClasses: Iterable[type]
+        :return: Such class, or None if there're no candidates.
+        :rtype: type
+        """
+        return min(recipeClasses, key=lambda recipeClass: self._order[recipeClass], default=None)
+
+    def _name_matches(self, name: str, version: str) -> Tuple[type, type]:
+        """
+        Retrieves the recipe classes which support given flake name, pinning or accepting given version.
+        :param name: The flake name.
+        :type name: str
+        :param version: The flake version.
+        :type version: str
+        :return: The first recipe class pinning the version exactly, and the first one whose spec is compatible with it.
+        :rtype: Tuple[type, type]
+        """
+        exact = []
+        aux = self._by_name_and_version.get((name, version), None)
+        if aux:
+            exact.append(aux)
+        compatible = []
+        intervals = self._intervals.get(name, None)
+        if intervals:
+            for spec, _, recipeClass in intervals.covering(version):
+                if VersionSpec.parse(spec).is_exact(version):
+                    exact.append(recipeClass)
+                else:
+                    compatible.append(recipeClass)
+        for spec, _, recipeClass in self.entries_for_name(name):
+            if self.__class__.overrides(recipeClass, "compatible_versions"):
+                if VersionSpec.parse(spec).is_exact(version):
+                    exact.append(recipeClass)
+                elif recipeClass.compatible_versions(spec, version):
+                    compatible.append(recipeClass)
+        return (self._first(exact), self._first(compatible))
+
+    def best_match(self, flake) -> type:
+        """
+        Retrieves the recipe class most similar to given flake.
+        The scores mirror FlakeRecipe.similarity: 1.0 if supported or if the version matches exactly,
+        0.9 for compatible versions, 0.7 for a name match, and 0.5 for a type match.
+        :param flake: The flake.
+        :type flake: Flake from pythonedanixflakes.flake
+        :return: The recipe class, or None if no recipe matches.
+        :rtype: type
+        """
+        exact, compatible = self._name_matches(flake.name, flake.version)
+        supported = [ recipeClass for recipeClass in self._custom_supports if recipeClass.supports(flake) ]
+        if supported:
+            return self._first(supported + ([ exact ] if exact else []))
+        return (exact
+                or compatible
+                or self._first(recipeClass for _, _, recipeClass in self.entries_for_name(flake.name))
+                or self._first(self.recipe_classes_for_type(flake.python_package.get_type())))
+
+    def best_matches(self, flakes: List) -> List:
+        """
+        Retrieves the recipe class most similar to each of given flakes, with the same results as best_match().
+        Instead of scoring every (flake, recipe) pair, the name, version and type columns are compared once per
+        distinct value, and the resulting scores are broadcast back to the flakes sharing them.
+        :param flakes: The flakes.
+        :type flakes: List[Flake from pythonedanixflakes.flake]
+        :return: The recipe class for each flake (or None), in the same order.
+        :rtype: List[type]
+        """
+        keys = [ (flake.name, flake.version, flake.python_package.get_type()) for flake in flakes ]
+        by_key = dict.fromkeys(keys)
+        # name and version columns: exact and compatible recipes for each distinct (name, version)
+        by_name_and_version = { (name, version): self._name_matches(name, version) for name, version, _ in by_key }
+        # name column: first recipe class for each distinct name
+        first_by_name = { name: self._first(recipeClass for _, _, recipeClass in self.entries_for_name(name)) for name, _, _ in by_key }
+        # type column: first recipe class for each distinct type
+        first_by_type = { flakeType: self._first(self.recipe_classes_for_type(flakeType)) for _, _, flakeType in by_key }
+        for key in by_key:
+            name, version, flakeType = key
+            exact, compatible = by_name_and_version[(name, version)]
+            by_key[key] = exact or compatible or first_by_name[name] or first_by_type[flakeType]
+        result = [ by_key[key] for key in keys ]
+        if self._custom_supports:
+            for position, flake in enumerate(flakes):
+                supported = [ recipeClass for recipeClass in self._custom_supports if recipeClass.supports(flake) ]
+                if supported:
+                    exact, _ = by_name_and_version[keys[position][:2]]
+                    result[position] = self._first(supported + ([ exact ] if exact else []))
+        return result
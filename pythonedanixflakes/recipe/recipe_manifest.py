@@ -0,0 +1,227 @@
+"""
+pythonedanixflakes/recipe/recipe_manifest.py
+
+This file defines the RecipeManifest class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import inspect
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List
+
+class RecipeManifest():
+    """
+    Precompiled, on-disk summary of the available recipe classes.
+
+    Class name: RecipeManifest
+
+    Responsibilities:
+        - Store, for each recipe class, its module path, supported flakes, flake type and template folder.
+        - Load all that information in a single read.
+        - Detect stale entries by comparing the recipe.toml modification time and size.
+
+    Collaborators:
+        - FlakeRecipe: Initializes itself from the manifest when its entry is fresh.
+        - FlakeRecipeRepo: Loads and refreshes the manifest.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str, entries: Dict[str, Dict] = None):
+        """
+        Creates a new RecipeManifest instance.
+        :param path: The path of the manifest file.
+        :type path: str
+        :param entries: The manifest entries, indexed by recipe class key.
+        :type entries: Dict[str, Dict]
+        """
+        super().__init__()
+        self._path = path
+        self._entries = entries or {}
+
+    @property
+    def path(self) -> str:
+        """
+        Retrieves the path of the manifest file.
+        :return: Such path.
+        :rtype: str
+        """
+        return self._path
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        """
+        Retrieves the manifest entries.
+        :return: Such entries, indexed by recipe class key.
+        :rtype: Dict[str, Dict]
+        """
+        return self._entries
+
+    @classmethod
+    def key_for(cls, recipeClass) -> str:
+        """
+        Retrieves the key identifying given recipe class in the manifest.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :return: The key.
+        :rtype: str
+        """
+        return f'{recipeClass.__module__}.{recipeClass.__qualname__}'
+
+    @classmethod
+    def stamp(cls, path: str) -> List[int]:
+        """
+        Retrieves the stamp used to detect changes in given file.
+        :param path: The file path.
+        :type path: str
+        :return: The modification time (in nanoseconds) and size, or None if the file does not exist.
+        :rtype: List[int]
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [ stat.st_mtime_ns, stat.st_size ]
+
+    @classmethod
+    def scan(cls, recipeClass) -> Dict:
+        """
+        Builds the manifest entry of given recipe class, inspecting its sources and recipe.toml.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :return: The entry.
+        :rtype: Dict
+        """
+        source_file = inspect.getsourcefile(recipeClass)
+        recipe_toml_file = os.path.join(Path(source_file).parent, "recipe.toml")
+        return {
+            "module": recipeClass.__module__,
+            "source": source_file,
+            "recipe_toml": recipe_toml_file,
+            "stamp": cls.stamp(recipe_toml_file),
+            "flakes": recipeClass.supported_flakes(),
+            "type": recipeClass.flake_type(),
+            "template_folder": str(Path(source_file).parent)
+        }
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Loads the manifest from given file, in a single read.
+        :param path: The manifest file.
+        :type path: str
+        :return: The manifest. It's empty if the file does not exist or is not compatible.
+        :rtype: RecipeManifest from pythonedanixflakes.recipe.recipe_manifest
+        """
+        entries = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                contents = json.load(file)
+            if contents.get("version", None) == cls.FORMAT_VERSION:
+                entries = contents.get("recipes", {})
+            else:
+                logging.getLogger(__name__).info(f'Ignoring incompatible recipe manifest {path}')
+        return cls(path, entries)
+
+    @classmethod
+    def build(cls, recipeClasses: List, path: str):
+        """
+        Builds a new manifest from scratch, and writes it to given file.
+        :param recipeClasses: The recipe classes.
+        :type recipeClasses: List[type]
+        :param path: The manifest file.
+        :type path: str
+        :return: The manifest.
+        :rtype: RecipeManifest from pythonedanixflakes.recipe.recipe_manifest
+        """
+        result = cls(path)
+        result.refresh(recipeClasses)
+        return result
+
+    def write(self):
+        """
+        Writes the manifest to disk.
+        """
+        folder = os.path.dirname(self._path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_file = f'{self._path}.tmp'
+        with open(temp_file, "w") as file:
+            json.dump({ "version": self.__class__.FORMAT_VERSION, "recipes": self._entries }, file, separators=(",", ":"))
+        os.replace(temp_file, self._path)
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """
+        Checks if given entry still matches its recipe.toml file.
+        :param entry: The entry.
+        :type entry: Dict
+        :return: True in such case.
+        :rtype: bool
+        """
+        stamp = entry.get("stamp", None)
+        return stamp is not None and self.__class__.stamp(entry.get("recipe_toml", "")) == stamp
+
+    def entry_for(self, recipeClass) -> Dict:
+        """
+        Retrieves the entry of given recipe class, if it's fresh.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :return: The entry, or None if it's missing or stale.
+        :rtype: Dict
+        """
+        result = self._entries.get(self.__class__.key_for(recipeClass), None)
+        if result and not self.is_fresh(result):
+            result = None
+        return result
+
+    def recipe_toml_file_for(self, recipeClass) -> str:
+        """
+        Retrieves the recipe.toml path of given recipe class, if known.
+        :param recipeClass: The recipe class.
+        :type recipeClass: type
+        :return: The path, or None if the class is not in the manifest.
+        :rtype: str
+        """
+        result = None
+        entry = self._entries.get(self.__class__.key_for(recipeClass), None)
+        if entry:
+            result = entry.get("recipe_toml", None)
+        return result
+
+    def refresh(self, recipeClasses: List) -> int:
+        """
+        Rescans the stale or missing entries of given recipe classes, and writes the manifest if anything changed.
+        :param recipeClasses: The recipe classes.
+        :type recipeClasses: List[type]
+        :return: The number of rescanned entries.
+        :rtype: int
+        """
+        result = 0
+        for recipeClass in recipeClasses:
+            if not recipeClass.should_initialize():
+                continue
+            key = self.__class__.key_for(recipeClass)
+            entry = self._entries.get(key, None)
+            if not entry or not self.is_fresh(entry):
+                self._entries[key] = self.__class__.scan(recipeClass)
+                result += 1
+        if result > 0 or not os.path.exists(self._path):
+            self.write()
+        logging.getLogger(__name__).debug(f'Recipe manifest {self._path} refreshed ({result} entries rescanned)')
+        return result
@@ -0,0 +1,132 @@
+"""
+pythonedanixflakes/recipe/recipe_toml_cache.py
+
+This file defines the RecipeTomlCache class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.toml_parser import TomlParser
+
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+
+class RecipeTomlCache():
+    """
+    Process-wide cache of parsed recipe.toml files.
+
+    Class name: RecipeTomlCache
+
+    Responsibilities:
+        - Parse each recipe.toml file at most once per change.
+        - Invalidate entries when the file's modification time or size change.
+        - Keep hit/miss counters.
+
+    Collaborators:
+        - FlakeRecipe: Reads its recipe.toml through this cache.
+        - TomlParser: Parses the files.
+    """
+
+    _entries = {}
+    _hits = 0
+    _misses = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def stamp(cls, path: str) -> Tuple[int, int]:
+        """
+        Retrieves the stamp used to detect changes in given file.
+        :param path: The file path.
+        :type path: str
+        :return: The modification time (in nanoseconds) and size of the file.
+        :rtype: Tuple[int, int]
+        """
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def read(cls, path: str) -> Dict:
+        """
+        Retrieves the parsed contents of given recipe.toml file.
+        :param path: The recipe.toml path.
+        :type path: str
+        :return: The parsed contents. Callers must not modify it.
+        :rtype: Dict
+        """
+        key = os.path.abspath(path)
+        stamp = cls.stamp(key)
+        with cls._lock:
+            entry = cls._entries.get(key, None)
+            if entry and entry[0] == stamp:
+                cls._hits += 1
+                return entry[1]
+            cls._misses += 1
+        logging.getLogger(__name__).debug(f'Parsing {key}')
+        result = TomlParser.load(key)
+        with cls._lock:
+            cls._entries[key] = (stamp, result)
+        return result
+
+    @classmethod
+    def invalidate(cls, path: str = None):
+        """
+        Discards the cached entry of given file, or all entries if no file is provided.
+        :param path: The recipe.toml path.
+        :type path: str
+        """
+        with cls._lock:
+            if path is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(os.path.abspath(path), None)
+
+    @classmethod
+    def hits(cls) -> int:
+        """
+        Retrieves the number of reads served from the cache.
+        :return: Such number.
+        :rtype: int
+        """
+        return cls._hits
+
+    @classmethod
+    def misses(cls) -> int:
+        """
+        Retrieves the number of reads that required parsing the file.
+        :return: Such number.
+        :rtype: int
+        """
+        return cls._misses
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """
+        Retrieves the cache statistics.
+        :return: The hits, misses and number of cached entries.
+        :rtype: Dict[str, int]
+        """
+        with cls._lock:
+            return { "hits": cls._hits, "misses": cls._misses, "entries": len(cls._entries) }
+
+    @classmethod
+    def reset_stats(cls):
+        """
+        Resets the hit/miss counters.
+        """
+        with cls._lock:
+            cls._hits = 0
+            cls._misses = 0
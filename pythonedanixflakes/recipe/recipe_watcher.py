@@ -0,0 +1,152 @@
+"""
+pythonedanixflakes/recipe/recipe_watcher.py
+
+This file defines the RecipeWatcher class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import logging
+import os
+import threading
+from typing import Dict, List, Tuple
+
+class RecipeWatcher():
+    """
+    Polls recipe folders and reloads the recipes whose recipe.toml or templates change.
+
+    Class name: RecipeWatcher
+
+    Responsibilities:
+        - Take snapshots of the modification time and size of the files in each recipe folder.
+        - Detect added, removed and modified files, without relying on inotify.
+        - Reload only the affected recipe classes.
+
+    Collaborators:
+        - FlakeRecipe: The watched classes, reloaded through FlakeRecipe.reload().
+    """
+
+    IGNORED_SUFFIXES = (".py", ".pyc", ".pyo", ".tmp", "~")
+    IGNORED_FOLDERS = ("__pycache__", ".git")
+
+    def __init__(self, recipeClasses: List, interval: float = 2.0):
+        """
+        Creates a new RecipeWatcher instance.
+        :param recipeClasses: The recipe classes to watch.
+        :type recipeClasses: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        :param interval: The polling interval, in seconds.
+        :type interval: float
+        """
+        super().__init__()
+        self._interval = interval
+        self._folders = {}
+        for recipeClass in recipeClasses:
+            if recipeClass.should_initialize():
+                self._folders.setdefault(recipeClass.recipe_folder(), []).append(recipeClass)
+        self._snapshots = { folder: self.__class__.snapshot(folder) for folder in self._folders }
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def interval(self) -> float:
+        """
+        Retrieves the polling interval.
+        :return: Such interval, in seconds.
+        :rtype: float
+        """
+        return self._interval
+
+    @classmethod
+    def snapshot(cls, folder: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Retrieves the modification time and size of the recipe.toml and template files in given folder.
+        :param folder: The recipe folder.
+        :type folder: str
+        :return: The stamp of each file, indexed by path.
+        :rtype: Dict[str, Tuple[int, int]]
+        """
+        result = {}
+        for root, folders, files in os.walk(folder):
+            folders[:] = [ aux for aux in folders if aux not in cls.IGNORED_FOLDERS ]
+            for file in files:
+                if file.endswith(cls.IGNORED_SUFFIXES):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                result[path] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+    @classmethod
+    def changes(cls, before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> List[str]:
+        """
+        Compares two snapshots.
+        :param before: The previous snapshot.
+        :type before: Dict[str, Tuple[int, int]]
+        :param after: The current snapshot.
+        :type after: Dict[str, Tuple[int, int]]
+        :return: The added, removed or modified files.
+        :rtype: List[str]
+        """
+        return sorted(path for path in set(before) | set(after) if before.get(path) != after.get(path))
+
+    def poll(self) -> List:
+        """
+        Checks the recipe folders once, and reloads the recipe classes affected by any change.
+        :return: The reloaded recipe classes.
+        :rtype: List[FlakeRecipe from pythonedanixflakes.recipe.flake_recipe]
+        """
+        result = []
+        for folder, recipeClasses in self._folders.items():
+            current = self.__class__.snapshot(folder)
+            changed = self.__class__.changes(self._snapshots[folder], current)
+            self._snapshots[folder] = current
+            if not changed:
+                continue
+            for recipeClass in recipeClasses:
+                logging.getLogger(__name__).info(f'Reloading recipe {recipeClass.__name__} ({len(changed)} files changed in {folder})')
+                try:
+                    recipeClass.reload(changed)
+                    result.append(recipeClass)
+                except Exception as error:
+                    logging.getLogger(__name__).error(f'Could not reload recipe {recipeClass.__name__}: {error}')
+        return result
+
+    def start(self):
+        """
+        Starts polling in a background thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops polling.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """
+        Polls the recipe folders until stopped.
+        """
+        while not self._stop.wait(self._interval):
+            self.poll()
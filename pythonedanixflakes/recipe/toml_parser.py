@@ -0,0 +1,107 @@
+"""
+pythonedanixflakes/recipe/toml_parser.py
+
+This file defines the TomlParser class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import importlib
+import logging
+from typing import Dict, List
+
+class TomlParser():
+    """
+    Parses TOML files with the fastest available backend.
+
+    Class name: TomlParser
+
+    Responsibilities:
+        - Choose a TOML backend: the standard tomllib (Python 3.11+), tomli, or the pure-Python toml package.
+        - Parse files in the way each backend expects (binary for tomllib/tomli, text for toml).
+
+    Collaborators:
+        - RecipeTomlCache: Parses recipe.toml files through this class.
+    """
+
+    BACKENDS = [ "tomllib", "tomli", "toml" ]
+
+    _backend = None
+    _module = None
+
+    @classmethod
+    def available_backends(cls) -> List[str]:
+        """
+        Retrieves the backends which can be imported, in order of preference.
+        :return: Such backend names.
+        :rtype: List[str]
+        """
+        result = []
+        for name in cls.BACKENDS:
+            try:
+                importlib.import_module(name)
+                result.append(name)
+            except ImportError:
+                pass
+        return result
+
+    @classmethod
+    def use_backend(cls, name: str = None):
+        """
+        Specifies the backend to use.
+        :param name: The backend name, or None to pick the first available one.
+        :type name: str
+        """
+        if name is None:
+            available = cls.available_backends()
+            if not available:
+                raise ImportError(f'No TOML parser available (tried {", ".join(cls.BACKENDS)})')
+            name = available[0]
+        cls._module = importlib.import_module(name)
+        cls._backend = name
+        logging.getLogger(__name__).debug(f'Parsing TOML files with {name}')
+
+    @classmethod
+    def backend(cls) -> str:
+        """
+        Retrieves the name of the backend in use.
+        :return: Such name.
+        :rtype: str
+        """
+        if cls._module is None:
+            cls.use_backend()
+        return cls._backend
+
+    @classmethod
+    def load(cls, path: str, backend: str = None) -> Dict:
+        """
+        Parses given TOML file.
+        :param path: The file path.
+        :type path: str
+        :param backend: The backend to use, or None to use the current one.
+        :type backend: str
+        :return: The parsed contents.
+        :rtype: Dict
+        """
+        if backend is None:
+            backend = cls.backend()
+            module = cls._module
+        else:
+            module = importlib.import_module(backend)
+        if backend == "toml":
+            with open(path, "r") as file:
+                return module.loads(file.read())
+        with open(path, "rb") as file:
+            return module.load(file)
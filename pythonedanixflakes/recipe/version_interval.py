@@ -0,0 +1,158 @@
+"""
+pythonedanixflakes/recipe/version_interval.py
+
+This file defines the VersionInterval class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from packaging.version import Version
+
+class VersionInterval():
+    """
+    A range of versions, with optional and inclusive/exclusive bounds.
+
+    Class name: VersionInterval
+
+    Responsibilities:
+        - Represent a contiguous range of PEP 440 versions.
+        - Check if a version falls in the range.
+        - Intersect ranges.
+
+    Collaborators:
+        - VersionSpec: Describes version specs as unions of intervals.
+    """
+
+    def __init__(self, lower: Version = None, lowerInclusive: bool = True, upper: Version = None, upperInclusive: bool = False):
+        """
+        Creates a new VersionInterval instance.
+        :param lower: The lower bound, or None if unbounded.
+        :type lower: Version from packaging.version
+        :param lowerInclusive: Whether the lower bound is included.
+        :type lowerInclusive: bool
+        :param upper: The upper bound, or None if unbounded.
+        :type upper: Version from packaging.version
+        :param upperInclusive: Whether the upper bound is included.
+        :type upperInclusive: bool
+        """
+        super().__init__()
+        self._lower = lower
+        self._lower_inclusive = lowerInclusive
+        self._upper = upper
+        self._upper_inclusive = upperInclusive
+
+    @property
+    def lower(self) -> Version:
+        """
+        Retrieves the lower bound.
+        :return: Such version, or None if unbounded.
+        :rtype: Version from packaging.version
+        """
+        return self._lower
+
+    @property
+    def lower_inclusive(self) -> bool:
+        """
+        Checks if the lower bound is included.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._lower_inclusive
+
+    @property
+    def upper(self) -> Version:
+        """
+        Retrieves the upper bound.
+        :return: Such version, or None if unbounded.
+        :rtype: Version from packaging.version
+        """
+        return self._upper
+
+    @property
+    def upper_inclusive(self) -> bool:
+        """
+        Checks if the upper bound is included.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._upper_inclusive
+
+    @classmethod
+    def exactly(cls, version: Version):
+        """
+        Builds an interval containing only given version.
+        :param version: The version.
+        :type version: Version from packaging.version
+        :return: The interval.
+        :rtype: VersionInterval from pythonedanixflakes.recipe.version_interval
+        """
+        return cls(version, True, version, True)
+
+    def is_empty(self) -> bool:
+        """
+        Checks if the interval contains no versions.
+        :return: True in such case.
+        :rtype: bool
+        """
+        if self._lower is None or self._upper is None:
+            return False
+        if self._lower == self._upper:
+            return not (self._lower_inclusive and self._upper_inclusive)
+        return self._lower > self._upper
+
+    def contains(self, version: Version) -> bool:
+        """
+        Checks if given version falls in the interval.
+        :param version: The version.
+        :type version: Version from packaging.version
+        :return: True in such case.
+        :rtype: bool
+        """
+        if self._lower is not None:
+            if version < self._lower or (version == self._lower and not self._lower_inclusive):
+                return False
+        if self._upper is not None:
+            if version > self._upper or (version == self._upper and not self._upper_inclusive):
+                return False
+        return True
+
+    def intersect(self, other):
+        """
+        Intersects this interval with given one.
+        :param other: The other interval.
+        :type other: VersionInterval from pythonedanixflakes.recipe.version_interval
+        :return: The intersection, or None if it's empty.
+        :rtype: VersionInterval from pythonedanixflakes.recipe.version_interval
+        """
+        lower, lower_inclusive = self._lower, self._lower_inclusive
+        if other.lower is not None and (lower is None or other.lower > lower or (other.lower == lower and not other.lower_inclusive)):
+            lower, lower_inclusive = other.lower, other.lower_inclusive
+        upper, upper_inclusive = self._upper, self._upper_inclusive
+        if other.upper is not None and (upper is None or other.upper < upper or (other.upper == upper and not other.upper_inclusive)):
+            upper, upper_inclusive = other.upper, other.upper_inclusive
+        result = self.__class__(lower, lower_inclusive, upper, upper_inclusive)
+        if result.is_empty():
+            result = None
+        return result
+
+    def __repr__(self) -> str:
+        """
+        Provides a string representation of the interval.
+        :return: Such representation.
+        :rtype: str
+        """
+        lower = "(-inf" if self._lower is None else f'{"[" if self._lower_inclusive else "("}{self._lower}'
+        upper = "+inf)" if self._upper is None else f'{self._upper}{"]" if self._upper_inclusive else ")"}'
+        return f'{lower}, {upper}'
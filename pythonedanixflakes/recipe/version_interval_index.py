@@ -0,0 +1,93 @@
+"""
+pythonedanixflakes/recipe/version_interval_index.py
+
+This file defines the VersionIntervalIndex class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.version_spec import VersionSpec
+
+import bisect
+from typing import Any, List, Tuple
+
+class VersionIntervalIndex():
+    """
+    Sorted structure answering which entries have a version spec covering a given version.
+
+    Class name: VersionIntervalIndex
+
+    Responsibilities:
+        - Split the version line at every interval bound, and precompute the entries covering each piece.
+        - Find the entries covering a version with a binary search.
+
+    Collaborators:
+        - VersionSpec: The specs of the indexed entries.
+        - RecipeIndex: Keeps one VersionIntervalIndex per flake name.
+    """
+
+    def __init__(self, entries: List[Tuple[str, Any]]):
+        """
+        Creates a new VersionIntervalIndex instance.
+        :param entries: The (version spec, value) pairs.
+        :type entries: List[Tuple[str, Any]]
+        """
+        super().__init__()
+        self._literals = {}
+        parsed = []
+        for spec, value in entries:
+            versionSpec = VersionSpec.parse(spec)
+            if versionSpec.literal is not None:
+                self._literals.setdefault(versionSpec.literal, []).append(value)
+            else:
+                parsed.append((versionSpec, value))
+        self._points = sorted({ bound for versionSpec, _ in parsed for interval in versionSpec.intervals for bound in (interval.lower, interval.upper) if bound is not None })
+        # slot 2*i+1 is exactly self._points[i]; slot 2*i is the open range right before it
+        self._slots = [ [] for _ in range(2 * len(self._points) + 1) ]
+        for versionSpec, value in parsed:
+            for interval in versionSpec.intervals:
+                if interval.lower is None:
+                    first = 0
+                else:
+                    first = 2 * bisect.bisect_left(self._points, interval.lower) + (1 if interval.lower_inclusive else 2)
+                if interval.upper is None:
+                    last = len(self._slots) - 1
+                else:
+                    last = 2 * bisect.bisect_left(self._points, interval.upper) + (1 if interval.upper_inclusive else 0)
+                for slot in range(first, last + 1):
+                    if value not in self._slots[slot]:
+                        self._slots[slot].append(value)
+
+    def covering(self, version: str) -> List:
+        """
+        Retrieves the values whose version spec covers given version.
+        :param version: The version.
+        :type version: str
+        :return: Such values, in no particular order.
+        :rtype: List
+        """
+        parsed = VersionSpec.version(version)
+        if parsed is None:
+            return self._literals.get(str(version).strip(), [])
+        position = bisect.bisect_left(self._points, parsed)
+        if position < len(self._points) and self._points[position] == parsed:
+            slot = 2 * position + 1
+        else:
+            slot = 2 * position
+        result = self._slots[slot]
+        literals = self._literals.get(str(version).strip(), None)
+        if literals:
+            result = result + literals
+        return result
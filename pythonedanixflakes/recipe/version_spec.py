@@ -0,0 +1,250 @@
+"""
+pythonedanixflakes/recipe/version_spec.py
+
+This file defines the VersionSpec class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.lru_cache import LruCache
+from pythonedanixflakes.recipe.version_interval import VersionInterval
+
+from packaging.version import InvalidVersion, Version
+import re
+from typing import Dict, List
+
+class VersionSpec():
+    """
+    A parsed version spec, as found in the [flake] section of recipe.toml files.
+
+    Class name: VersionSpec
+
+    Responsibilities:
+        - Parse PEP 440 specs ("==", "!=", "<", "<=", ">", ">=", "~=", "===", wildcards and comma-separated clauses)
+          into unions of version intervals, once per distinct spec.
+        - Check if a version satisfies the spec.
+
+    Collaborators:
+        - VersionInterval: The ranges the spec is made of.
+        - FlakeRecipe: Uses specs to check version compatibility.
+    """
+
+    _CLAUSE = re.compile(r'^\s*(~=|===|==|!=|<=|>=|<|>)?\s*(\S+)\s*$')
+
+    _specs = LruCache(4096)
+    _versions = LruCache(16384)
+
+    def __init__(self, spec: str, intervals: List[VersionInterval] = None, literal: str = None):
+        """
+        Creates a new VersionSpec instance.
+        :param spec: The original spec.
+        :type spec: str
+        :param intervals: The intervals whose union the spec represents.
+        :type intervals: List[VersionInterval from pythonedanixflakes.recipe.version_interval]
+        :param literal: The text to compare versions to, for specs which are not PEP 440-compliant.
+        :type literal: str
+        """
+        super().__init__()
+        self._spec = spec
+        self._intervals = intervals or []
+        self._literal = literal
+
+    @property
+    def spec(self) -> str:
+        """
+        Retrieves the original spec.
+        :return: Such text.
+        :rtype: str
+        """
+        return self._spec
+
+    @property
+    def intervals(self) -> List[VersionInterval]:
+        """
+        Retrieves the intervals whose union the spec represents.
+        :return: Such intervals.
+        :rtype: List[VersionInterval from pythonedanixflakes.recipe.version_interval]
+        """
+        return self._intervals
+
+    @property
+    def literal(self) -> str:
+        """
+        Retrieves the text versions are compared to, if the spec is not PEP 440-compliant.
+        :return: Such text, or None if the spec was parsed successfully.
+        :rtype: str
+        """
+        return self._literal
+
+    @classmethod
+    def parse(cls, spec: str):
+        """
+        Retrieves the parsed version of given spec, parsing it only the first time.
+        :param spec: The spec.
+        :type spec: str
+        :return: The parsed spec.
+        :rtype: VersionSpec from pythonedanixflakes.recipe.version_spec
+        """
+        result = cls._specs.get(spec)
+        if result is None:
+            result = cls._parse(spec)
+            cls._specs.put(spec, result)
+        return result
+
+    @classmethod
+    def version(cls, text: str) -> Version:
+        """
+        Retrieves the parsed version of given text, parsing it only the first time.
+        :param text: The version.
+        :type text: str
+        :return: The version, or None if it's not PEP 440-compliant.
+        :rtype: Version from packaging.version
+        """
+        result = cls._versions.get(text, cls._versions)
+        if result is cls._versions:
+            try:
+                result = Version(str(text))
+            except InvalidVersion:
+                result = None
+            cls._versions.put(text, result)
+        return result
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Dict]:
+        """
+        Retrieves the statistics of the parsed specs and versions.
+        :return: Such statistics, indexed by memo.
+        :rtype: Dict[str, Dict]
+        """
+        return { "specs": cls._specs.stats(), "versions": cls._versions.stats() }
+
+    @classmethod
+    def _parse(cls, spec: str):
+        """
+        Parses given spec.
+        :param spec: The spec.
+        :type spec: str
+        :return: The parsed spec.
+        :rtype: VersionSpec from pythonedanixflakes.recipe.version_spec
+        """
+        text = str(spec).strip()
+        if text in ("", "*"):
+            return cls(spec, [ VersionInterval() ])
+        result = [ VersionInterval() ]
+        for clause in text.split(","):
+            intervals = cls._parse_clause(clause)
+            if intervals is None:
+                return cls(spec, literal=text)
+            result = [ aux for aux in (a.intersect(b) for a in result for b in intervals) if aux is not None ]
+        return cls(spec, result)
+
+    @classmethod
+    def _parse_clause(cls, clause: str) -> List[VersionInterval]:
+        """
+        Parses a single clause of a spec.
+        :param clause: The clause.
+        :type clause: str
+        :return: The intervals whose union the clause represents, or None if it's not PEP 440-compliant.
+        :rtype: List[VersionInterval from pythonedanixflakes.recipe.version_interval]
+        """
+        match = cls._CLAUSE.match(clause)
+        if not match:
+            return None
+        operator = match.group(1) or "=="
+        text = match.group(2)
+        if text.endswith(".*"):
+            if operator not in ("==", "!="):
+                return None
+            bounds = cls._prefix_bounds(text[:-2])
+            if bounds is None:
+                return None
+            lower, upper = bounds
+            if operator == "==":
+                return [ VersionInterval(lower, True, upper, False) ]
+            return [ VersionInterval(None, True, lower, False), VersionInterval(upper, True, None, False) ]
+        version = cls.version(text)
+        if version is None:
+            return None
+        if operator in ("==", "==="):
+            return [ VersionInterval.exactly(version) ]
+        if operator == "!=":
+            return [ VersionInterval(None, True, version, False), VersionInterval(version, False, None, False) ]
+        if operator == "<":
+            return [ VersionInterval(None, True, version, False) ]
+        if operator == "<=":
+            return [ VersionInterval(None, True, version, True) ]
+        if operator == ">":
+            return [ VersionInterval(version, False, None, False) ]
+        if operator == ">=":
+            return [ VersionInterval(version, True, None, False) ]
+        # ~=
+        if len(version.release) < 2:
+            return None
+        _, upper = cls._prefix_bounds(".".join(str(part) for part in version.release[:-1]))
+        return [ VersionInterval(version, True, upper, False) ]
+
+    @classmethod
+    def _prefix_bounds(cls, prefix: str):
+        """
+        Retrieves the bounds of the versions starting with given release prefix.
+        :param prefix: The prefix, i.e. "1.2" for "1.2.*".
+        :type prefix: str
+        :return: The inclusive lower bound and the exclusive upper bound, or None if the prefix is not numeric.
+        :rtype: Tuple[Version from packaging.version, Version from packaging.version]
+        """
+        parts = prefix.split(".")
+        if not all(part.isdigit() for part in parts):
+            return None
+        following = parts[:-1] + [ str(int(parts[-1]) + 1) ]
+        return (Version(f'{prefix}.dev0'), Version(f'{".".join(following)}.dev0'))
+
+    def contains(self, version: str) -> bool:
+        """
+        Checks if given version satisfies the spec.
+        :param version: The version.
+        :type version: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        if self._literal is not None:
+            return self._literal == str(version).strip()
+        parsed = self.__class__.version(version)
+        if parsed is None:
+            return False
+        return any(interval.contains(parsed) for interval in self._intervals)
+
+    def is_exact(self, version: str) -> bool:
+        """
+        Checks if the spec pins exactly given version.
+        :param version: The version.
+        :type version: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        if self._literal is not None:
+            return self._literal == str(version).strip()
+        parsed = self.__class__.version(version)
+        return (parsed is not None
+                and len(self._intervals) == 1
+                and self._intervals[0].lower == parsed
+                and self._intervals[0].upper == parsed)
+
+    def __repr__(self) -> str:
+        """
+        Provides a string representation of the spec.
+        :return: Such representation.
+        :rtype: str
+        """
+        return f'VersionSpec({self._spec!r})'
@@ -0,0 +1,69 @@
+"""
+tests/conftest.py
+
+This file defines the fixtures shared by the tests.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from types import SimpleNamespace
+
+def recipe_class(base: type = object, name: str = "Recipe", **attributes) -> type:
+    """
+    Builds a recipe class in memory, which does not look for its recipe.toml.
+    :param base: The base class.
+    :type base: type
+    :param name: The class name.
+    :type name: str
+    :param attributes: The class attributes, such as "_flakes" and "_type".
+    :type attributes: Dict
+    :return: The recipe class.
+    :rtype: type
+    """
+    return type(name, (base,), { "should_initialize": classmethod(lambda cls: False), **attributes })
+
+def flake(name: str = "pkg", version: str = "1.0", flakeType: str = None, **attributes) -> SimpleNamespace:
+    """
+    Builds a flake in memory, with no dependencies unless given.
+    :param name: The flake name.
+    :type name: str
+    :param version: The flake version.
+    :type version: str
+    :param flakeType: The type of its Python package, as in "setuptools".
+    :type flakeType: str
+    :param attributes: Any other attributes, such as "author" or the dependency lists.
+    :type attributes: Dict
+    :return: The flake.
+    :rtype: SimpleNamespace
+    """
+    values = {
+        "python_package": SimpleNamespace(get_type=lambda: flakeType),
+        "native_build_inputs": [],
+        "propagated_build_inputs": [],
+        "build_inputs": [],
+        "check_inputs": [],
+        "optional_build_inputs": [] }
+    values.update(attributes)
+    return SimpleNamespace(name=name, version=version, **values)
+
+@pytest.fixture
+def make_recipe_class():
+    return recipe_class
+
+@pytest.fixture
+def make_flake():
+    return flake
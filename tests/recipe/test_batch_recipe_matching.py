@@ -0,0 +1,85 @@
+"""
+tests/recipe/test_batch_recipe_matching.py
+
+This file checks the batch recipe matching against the scalar similarity path.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+FlakeRecipe = pytest.importorskip("pythonedanixflakes.recipe.flake_recipe").FlakeRecipe
+
+from pythonedanixflakes.recipe.recipe_index import RecipeIndex
+
+import random
+
+TYPES = [ None, "setuptools", "poetry" ]
+
+@pytest.fixture
+def matched_recipe(make_recipe_class):
+    """
+    Recipe built in memory, to match flakes against.
+    """
+    return make_recipe_class(FlakeRecipe, "MatchedRecipe", supports=classmethod(lambda cls, flake: False), process=lambda self: None)
+
+@pytest.fixture
+def pinned_recipe(matched_recipe):
+
+    class PinnedRecipe(matched_recipe):
+        """
+        Recipe supporting the flakes of a given author, whatever their name and version.
+        """
+        @classmethod
+        def should_initialize(cls) -> bool:
+            return True
+
+        @classmethod
+        def supports(cls, flake) -> bool:
+            return getattr(flake, "author", None) == cls.__name__
+
+    return PinnedRecipe
+
+def recipes(rnd: random.Random, count: int, matchedRecipe, pinnedRecipe):
+    result = []
+    for i in range(count):
+        name = f'pkg{rnd.randrange(count)}'
+        specs = [ f'{rnd.randrange(3)}.{rnd.randrange(3)}', f'{rnd.randrange(3)}.*', f'>={rnd.randrange(3)}.0,<{rnd.randrange(1, 4)}.0' ]
+        flakes = [ { name: spec } for spec in rnd.sample(specs, rnd.randrange(1, len(specs) + 1)) ]
+        base = pinnedRecipe if rnd.random() < 0.1 else matchedRecipe
+        result.append(type(f'Recipe{i}', (base,), { "_flakes": flakes, "_type": rnd.choice(TYPES) }))
+    return result
+
+def flakes(make_flake, rnd: random.Random, count: int, recipeCount: int):
+    return [ make_flake(f'pkg{rnd.randrange(recipeCount * 2)}', f'{rnd.randrange(3)}.{rnd.randrange(3)}', rnd.choice(TYPES + [ "flit" ]), author=f'Recipe{rnd.randrange(recipeCount * 4)}') for _ in range(count) ]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_matches_scalar_path(seed, matched_recipe, pinned_recipe, make_flake):
+    rnd = random.Random(seed)
+    recipeClasses = recipes(rnd, 40, matched_recipe, pinned_recipe)
+    targets = flakes(make_flake, rnd, 300, 40)
+    expected = [ FlakeRecipe.most_similar(recipeClasses, target) for target in targets ]
+    index = RecipeIndex(recipeClasses)
+    assert index.best_matches(targets) == expected
+    assert [ index.best_match(target) for target in targets ] == expected
+
+@pytest.mark.parametrize("recipeType, flakeType", [ (None, None), ("setuptools", "setuptools"), (None, "setuptools"), ("setuptools", None), ("setuptools", "poetry") ])
+def test_type_only_matches(recipeType, flakeType, matched_recipe, make_flake):
+    recipeClasses = [ type("Other", (matched_recipe,), { "_flakes": [ { "other": "1.0" } ], "_type": "flit" }),
+                      type("Typed", (matched_recipe,), { "_flakes": [ { "another": "1.0" } ], "_type": recipeType }) ]
+    target = make_flake("pkg", "1.0", flakeType)
+    expected = FlakeRecipe.most_similar(recipeClasses, target)
+    assert expected is (recipeClasses[1] if recipeType == flakeType else None)
+    assert RecipeIndex(recipeClasses).best_matches([ target ]) == [ expected ]
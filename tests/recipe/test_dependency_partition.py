@@ -0,0 +1,75 @@
+"""
+tests/recipe/test_dependency_partition.py
+
+This file tests the DependencyPartition class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.dependency_partition import DependencyPartition
+from pythonedanixflakes.recipe.ordered_deduplication import OrderedDeduplication
+
+class Package():
+    """
+    Python package, as seen by the partition.
+    """
+    def __init__(self, name: str, version: str, inNixpkgs: bool):
+        self.name = name
+        self.version = version
+        self._in_nixpkgs = inNixpkgs
+        self.checks = 0
+
+    def in_nixpkgs(self) -> bool:
+        self.checks += 1
+        return self._in_nixpkgs
+
+    def dedup_key(self):
+        return (OrderedDeduplication.normalize_name(self.name), self.version)
+
+def test_all_matches_deduplicating_the_concatenated_categories():
+    six = Package("six", "1.16.0", True)
+    attrs = Package("attrs", "23.1.0", False)
+    typing = Package("typing_extensions", "4.7.1", False)
+    typing_alias = Package("Typing-Extensions", "4.7.1", False)
+    pytest = Package("pytest", "7.4.0", True)
+    inputs = {
+        DependencyPartition.NATIVE_BUILD_INPUTS: [ six, attrs ],
+        DependencyPartition.PROPAGATED_BUILD_INPUTS: [ typing, six ],
+        DependencyPartition.BUILD_INPUTS: None,
+        DependencyPartition.CHECK_INPUTS: [ pytest, attrs, typing_alias ],
+        DependencyPartition.OPTIONAL_BUILD_INPUTS: [] }
+    partition = DependencyPartition(inputs)
+    concatenated = [ dep for category in DependencyPartition.CATEGORIES for dep in inputs[category] or [] ]
+    assert partition.nixpkgs() == OrderedDeduplication.remove_duplicates([ dep for dep in concatenated if dep._in_nixpkgs ])
+    assert partition.flakes() == OrderedDeduplication.remove_duplicates([ dep for dep in concatenated if not dep._in_nixpkgs ])
+    assert partition.flakes() == [ attrs, typing ]
+    assert partition.category(DependencyPartition.CHECK_INPUTS) == ([ pytest ], [ attrs, typing_alias ])
+    assert [ dep.checks for dep in [ six, attrs, typing, typing_alias, pytest ] ] == [ 1, 1, 1, 1, 1 ]
+
+def test_each_category_is_split_on_its_own(make_flake):
+    six = Package("six", "1.16.0", True)
+    attrs = Package("attrs", "23.1.0", False)
+    pytest = Package("pytest", "7.4.0", True)
+    flake = make_flake(native_build_inputs=[ six, attrs, six ], propagated_build_inputs=[ attrs ], check_inputs=[ pytest ], build_inputs=None)
+    partition = DependencyPartition.of(flake)
+    assert partition.category(DependencyPartition.NATIVE_BUILD_INPUTS) == ([ six ], [ attrs ])
+    assert partition.nixpkgs(DependencyPartition.PROPAGATED_BUILD_INPUTS) == []
+    assert partition.flakes(DependencyPartition.PROPAGATED_BUILD_INPUTS) == [ attrs ]
+    assert partition.category(DependencyPartition.CHECK_INPUTS) == ([ pytest ], [])
+    assert partition.category(DependencyPartition.BUILD_INPUTS) == ([], [])
+    assert partition.category(DependencyPartition.OPTIONAL_BUILD_INPUTS) == ([], [])
+    assert partition.category("unknown") == ([], [])
+    assert partition.in_nixpkgs(six) and not partition.in_nixpkgs(attrs)
+    assert not partition.in_nixpkgs(Package("other", "1.0", True))
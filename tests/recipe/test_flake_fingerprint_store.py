@@ -0,0 +1,81 @@
+"""
+tests/recipe/test_flake_fingerprint_store.py
+
+This file tests the FlakeFingerprintStore and FlakeFingerprint classes.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from pythonedanixflakes.recipe.flake_fingerprint_store import FlakeFingerprintStore
+
+import os
+
+def test_unchanged_only_if_the_recorded_outputs_exist(tmp_path):
+    store = FlakeFingerprintStore(str(tmp_path / "fingerprints.json"))
+    store.record("pkg", "1.0", "abc", "Recipe", [ "flake.nix" ], str(tmp_path))
+    store.write()
+    store = FlakeFingerprintStore.load(store.path)
+    exists = lambda entry: all(os.path.exists(os.path.join(entry["url"], file)) for file in entry["files"])
+    assert store.is_unchanged("pkg", "1.0", "abc")
+    assert not store.is_unchanged("pkg", "1.0", "abc", exists)
+    (tmp_path / "flake.nix").write_text("{}")
+    assert store.is_unchanged("pkg", "1.0", "abc", exists)
+    assert not store.is_unchanged("pkg", "1.0", "def", exists)
+    assert not store.is_unchanged("pkg", "2.0", "abc", exists)
+    store.forget("pkg", "1.0")
+    assert not store.is_unchanged("pkg", "1.0", "abc", exists)
+
+def test_recipe_digest_covers_the_rendering_code_and_the_recipe_toml(tmp_path, make_recipe_class):
+    FlakeFingerprint = pytest.importorskip("pythonedanixflakes.recipe.flake_fingerprint").FlakeFingerprint
+    BaseFlakeRecipe = pytest.importorskip("pythonedanixflakes.recipe.base_flake_recipe").BaseFlakeRecipe
+    recipe_toml = tmp_path / "recipe.toml"
+    recipe_toml.write_text("[recipe]\n")
+
+    class Recipe(make_recipe_class(BaseFlakeRecipe)):
+        @classmethod
+        def recipe_toml_file(cls) -> str:
+            return str(recipe_toml)
+
+    files = [ os.path.basename(file) for file in FlakeFingerprint.source_files(Recipe) ]
+    for expected in [ "test_flake_fingerprint_store.py", "base_flake_recipe.py", "flake_recipe.py", "formatted_flake.py", "formatted_python_package_list.py", "recipe.toml" ]:
+        assert expected in files
+    digest = FlakeFingerprint.recipe_digest(Recipe)
+    assert FlakeFingerprint.recipe_digest(Recipe) == digest
+    recipe_toml.write_text("[recipe]\nversion = 2\n")
+    os.utime(recipe_toml, ns=(0, 0))
+    assert FlakeFingerprint.recipe_digest(Recipe) != digest
+
+def test_corrupt_or_incompatible_stores_start_empty(tmp_path):
+    for contents in [ '{"version": 1, "flakes": {', "\xff\xfe", "[]", '{"version": 0, "flakes": {"pkg-1.0": {}}}' ]:
+        path = tmp_path / "fingerprints.json"
+        path.write_bytes(contents.encode("latin-1"))
+        store = FlakeFingerprintStore.load(str(path))
+        assert store.entry_for("pkg", "1.0") is None
+        store.record("pkg", "1.0", "abc", "Recipe", [ "flake.nix" ])
+        store.write()
+        assert FlakeFingerprintStore.load(str(path)).entry_for("pkg", "1.0")["fingerprint"] == "abc"
+
+def test_unwritten_entries_are_counted_until_the_store_is_written(tmp_path):
+    store = FlakeFingerprintStore(str(tmp_path / "fingerprints.json"))
+    for version in [ "1.0", "2.0", "3.0" ]:
+        store.record("pkg", version, "abc", "Recipe", [ "flake.nix" ])
+    store.forget("pkg", "4.0")
+    assert store.unwritten == 3
+    store.write()
+    assert store.unwritten == 0
+    store.forget("pkg", "1.0")
+    assert store.unwritten == 1
@@ -0,0 +1,108 @@
+"""
+tests/recipe/test_flake_recipe_repo.py
+
+This file tests the FlakeRecipeRepo class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+FlakeRecipeRepo = pytest.importorskip("pythonedanixflakes.recipe.flake_recipe_repo").FlakeRecipeRepo
+
+from pythonedanixflakes.recipe.flake_recipe import FlakeRecipe
+
+import gc
+import weakref
+
+@pytest.fixture
+def listed_recipe(make_recipe_class):
+    """
+    Recipe built in memory, supporting a single flake.
+    """
+    return make_recipe_class(FlakeRecipe, "ListedRecipe", _flakes=[ { "pkg": "1.0" } ], _type=None, supports=classmethod(lambda cls, flake: False), process=lambda self: None)
+
+@pytest.fixture
+def author_recipe(listed_recipe):
+
+    class AuthorRecipe(listed_recipe):
+        """
+        Recipe supporting the flakes of a given author, whatever their name and version.
+        """
+        _flakes = [ { "other": "1.0" } ]
+
+        @classmethod
+        def should_initialize(cls) -> bool:
+            return True
+
+        @classmethod
+        def supports(cls, flake) -> bool:
+            return flake.author == "me"
+
+    return AuthorRecipe
+
+class ListingRepo(FlakeRecipeRepo):
+    """
+    Repository of the recipe classes given to it.
+    """
+    def __init__(self, recipeClasses):
+        super().__init__()
+        self._recipe_classes = recipeClasses
+
+    def find_recipe_classes_by_flake(self, flake):
+        return self._recipe_classes
+
+    def find_all_recipe_classes(self):
+        return self._recipe_classes
+
+def test_lookups_are_not_memoized_when_supports_is_overridden(listed_recipe, author_recipe, make_flake):
+    repo = ListingRepo([ listed_recipe, author_recipe ])
+    assert repo.find_best_recipe_class_by_flake(make_flake(author="you")) is listed_recipe
+    assert repo.find_best_recipe_class_by_flake(make_flake(author="me")) is listed_recipe
+    repo = ListingRepo([ author_recipe, listed_recipe ])
+    assert repo.find_best_recipe_class_by_flake(make_flake(author="you")) is listed_recipe
+    assert repo.find_best_recipe_class_by_flake(make_flake(author="me")) is author_recipe
+    assert FlakeRecipe.most_similar([ author_recipe, listed_recipe ], make_flake(author="you")) is listed_recipe
+    assert FlakeRecipe.most_similar([ author_recipe, listed_recipe ], make_flake(author="me")) is author_recipe
+
+def test_lookups_are_memoized_by_fingerprint(listed_recipe, make_flake):
+    repo = ListingRepo([ listed_recipe ])
+    FlakeRecipe.match_cache().clear()
+    before = FlakeRecipe.match_cache().stats()["hits"]
+    assert repo.find_best_recipe_class_by_flake(make_flake(author="you")) is listed_recipe
+    assert repo.find_best_recipe_class_by_flake(make_flake(author="me")) is listed_recipe
+    assert FlakeRecipe.match_cache().stats()["hits"] == before + 1
+
+def test_reloading_a_recipe_discards_the_index(listed_recipe):
+    repo = ListingRepo([ listed_recipe ])
+    index = repo.recipe_index()
+    assert repo.recipe_index() is index
+    listed_recipe.reload()
+    assert repo.recipe_index() is not index
+
+def test_reload_listeners_do_not_keep_repositories_alive(listed_recipe):
+    repo = weakref.ref(ListingRepo([ listed_recipe ]))
+    gc.collect()
+    assert repo() is None
+    listed_recipe.reload()
+
+def test_removed_reload_listeners_are_not_notified(listed_recipe):
+    reloaded = []
+    listener = lambda recipeClass, changedFiles: reloaded.append(recipeClass)
+    FlakeRecipe.add_reload_listener(listener)
+    listed_recipe.reload()
+    FlakeRecipe.remove_reload_listener(listener)
+    listed_recipe.reload()
+    assert reloaded == [ listed_recipe ]
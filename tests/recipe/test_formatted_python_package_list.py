@@ -0,0 +1,76 @@
+"""
+tests/recipe/test_formatted_python_package_list.py
+
+This file tests the FormattedPythonPackageList class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+FormattedPythonPackageList = pytest.importorskip("pythonedanixflakes.recipe.formatted_python_package_list").FormattedPythonPackageList
+
+from types import SimpleNamespace
+
+class Package():
+    """
+    Formatted Python package, as seen by the list.
+    """
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+class WrappingPackage(Package):
+    """
+    Formatted Python package declaring a method, and delegating anything else to the package it wraps.
+    """
+    def __init__(self, name: str, wrapped):
+        super().__init__(name)
+        self._wrapped = wrapped
+
+    def declaration(self) -> str:
+        return f'{self.name} = {self.name};'
+
+    def __getattr__(self, attr):
+        return getattr(self._wrapped, attr)
+
+def test_accessors_are_resolved_once_per_element_class_and_name():
+    package = WrappingPackage("a", SimpleNamespace(version=lambda: "1.0", url="https://a"))
+    for funcName, expected in [ ("name", "a"), ("declaration", "a = a;"), ("version", "1.0"), ("url", "https://a") ]:
+        accessor = FormattedPythonPackageList.accessor_for(WrappingPackage, funcName)
+        assert accessor(package) == expected
+        assert FormattedPythonPackageList.accessor_for(WrappingPackage, funcName) is accessor
+    packages = FormattedPythonPackageList([ package, WrappingPackage("b", SimpleNamespace(version=lambda: "2.0")) ], "version", separator=",")
+    assert str(packages) == "1.0,2.0"
+
+def test_list_is_a_copy_and_list_methods_modify_only_this_instance():
+    packages = FormattedPythonPackageList([ Package("b"), Package("a") ], "name", separator=",")
+    derived = packages.with_separator(";")
+    assert str(packages) == "b,a"
+    copy = packages.list
+    assert isinstance(copy, list)
+    copy.append(Package("c"))
+    assert str(packages) == "b,a"
+    packages.append(Package("c"))
+    assert str(packages) == "b,a,c"
+    assert packages._fmt is packages.items
+    packages.sort(key=lambda dep: dep.name)
+    assert str(packages) == "a,b,c"
+    assert packages.index(packages.items[2]) == 2
+    assert str(derived) == "b;a"
+    assert str(packages.with_separator(";")) == "a;b;c"
@@ -0,0 +1,41 @@
+"""
+tests/recipe/test_formatted_python_package_pool.py
+
+This file tests the FormattedPythonPackagePool class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.formatted_python_package_pool import FormattedPythonPackagePool
+
+from types import SimpleNamespace
+
+class Formatted():
+    """
+    Formatted package, rendering the name of the package it wraps.
+    """
+    def __init__(self, pkg):
+        self.pkg = pkg
+
+    def __str__(self) -> str:
+        return self.pkg.name
+
+def test_names_are_rendered_as_each_flake_spells_them():
+    FormattedPythonPackagePool.clear()
+    first = FormattedPythonPackagePool.get(Formatted, SimpleNamespace(name="Typing-Extensions", version="4.7.1"))
+    second = FormattedPythonPackagePool.get(Formatted, SimpleNamespace(name="typing_extensions", version="4.7.1"))
+    assert [ str(first), str(second) ] == [ "Typing-Extensions", "typing_extensions" ]
+    assert FormattedPythonPackagePool.get(Formatted, SimpleNamespace(name="typing_extensions", version="4.7.1")) is second
+    assert FormattedPythonPackagePool.get(Formatted, SimpleNamespace(name="typing_extensions", version="4.8.0")) is not second
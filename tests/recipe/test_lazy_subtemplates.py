@@ -0,0 +1,64 @@
+"""
+tests/recipe/test_lazy_subtemplates.py
+
+This file tests the LazySubtemplates class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from pythonedanixflakes.recipe.lazy_subtemplates import LazySubtemplates
+
+class CountingBuilder():
+    """
+    Builder of the kinds "names" and "declarations", the latter built from the former.
+    """
+    def __init__(self):
+        self.built = []
+        self.inputs = 0
+
+    def packages(self):
+        self.inputs += 1
+        return [ "a", "b" ]
+
+    def __call__(self, inputs, kind, subtemplates):
+        self.built.append(kind)
+        if kind == "names":
+            return ",".join(inputs)
+        if kind == "declarations":
+            return f'[{subtemplates["names"]}]'
+        return None
+
+def test_each_kind_is_built_once_and_only_when_asked_for():
+    builder = CountingBuilder()
+    subtemplates = LazySubtemplates(builder, builder.packages)
+    assert builder.built == []
+    assert builder.inputs == 0
+    assert subtemplates["declarations"] == "[a,b]"
+    assert subtemplates["names"] == "a,b"
+    assert subtemplates.get("declarations") == "[a,b]"
+    assert builder.built == [ "declarations", "names" ]
+    assert builder.inputs == 1
+    assert subtemplates.computed() == { "names": "a,b", "declarations": "[a,b]" }
+
+def test_unsupported_kinds_are_not_cached():
+    builder = CountingBuilder()
+    subtemplates = LazySubtemplates(builder, [ "a" ])
+    assert subtemplates.get("other", "none") == "none"
+    with pytest.raises(KeyError):
+        subtemplates["other"]
+    assert builder.built == [ "other", "other" ]
+    assert subtemplates.computed() == {}
@@ -0,0 +1,62 @@
+"""
+tests/recipe/test_nix_template_cache.py
+
+This file tests the NixTemplateCache class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+nix_template_cache = pytest.importorskip("pythonedanixflakes.recipe.nix_template_cache")
+NixTemplateCache = nix_template_cache.NixTemplateCache
+
+class ParsedTemplate():
+    """
+    Template recording its contents when parsed, as NixTemplate parses them.
+    """
+    def __init__(self, folder: str, path: str, contents: str):
+        self.folder = folder
+        self.path = path
+        self.contents = contents
+
+@pytest.fixture
+def recipe_classes(monkeypatch, make_recipe_class):
+    monkeypatch.setattr(nix_template_cache, "NixTemplate", ParsedTemplate)
+    result = [ make_recipe_class(name="First"), make_recipe_class(name="Second") ]
+    yield result
+    for recipeClass in result:
+        NixTemplateCache.invalidate(recipeClass)
+
+def test_entries_are_replaced_when_the_contents_change(recipe_classes):
+    first, _ = recipe_classes
+    template = NixTemplateCache.template(first, "", "flake.nix", "a")
+    assert NixTemplateCache.template(first, "", "flake.nix", "a") is template
+    changed = NixTemplateCache.template(first, "", "flake.nix", "b")
+    assert changed is not template
+    assert changed.contents == "b"
+    assert NixTemplateCache.template(first, "", "flake.nix", "b") is changed
+    assert NixTemplateCache.template(first, "", "flake.nix", "a") is not template
+
+def test_invalidating_a_recipe_class_keeps_the_templates_of_the_others(recipe_classes):
+    first, second = recipe_classes
+    firstTemplate = NixTemplateCache.template(first, "", "flake.nix", "a")
+    secondTemplate = NixTemplateCache.template(second, "", "flake.nix", "a")
+    assert firstTemplate is not secondTemplate
+    NixTemplateCache.invalidate(first)
+    assert NixTemplateCache.template(first, "", "flake.nix", "a") is not firstTemplate
+    assert NixTemplateCache.template(second, "", "flake.nix", "a") is secondTemplate
+    NixTemplateCache.invalidate()
+    assert NixTemplateCache.template(second, "", "flake.nix", "a") is not secondTemplate
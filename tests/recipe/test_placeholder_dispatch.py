@@ -0,0 +1,63 @@
+"""
+tests/recipe/test_placeholder_dispatch.py
+
+This file tests the PlaceholderDispatch class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+base_flake_recipe = pytest.importorskip("pythonedanixflakes.recipe.base_flake_recipe")
+BaseFlakeRecipe = base_flake_recipe.BaseFlakeRecipe
+
+from pythonedanixflakes.recipe.placeholder_dispatch import PlaceholderDispatch
+from pythonedanixflakes.recipe.recipe_does_not_support_placeholder import RecipeDoesNotSupportPlaceholder
+
+@pytest.fixture
+def release_recipe(make_recipe_class, make_flake):
+
+    class ReleaseRecipe(make_recipe_class(BaseFlakeRecipe)):
+        """
+        Recipe providing placeholders as a class constant and as an instance attribute.
+        """
+        nixpkgs_release = "23.05"
+
+        def __init__(self, flake):
+            super().__init__(flake)
+            self.extra = "extra"
+
+    return ReleaseRecipe(make_flake())
+
+def templates(contents: str):
+    return [ { "folder": "", "path": "flake.nix", "contents": contents } ]
+
+@pytest.mark.parametrize("contents", [ "$recipe.nixpkgs_release$", "$recipe.extra$", "$flake.flake.name$", "$flake.name$", "$recipe.declaration$" ])
+def test_data_attributes_and_formatted_flake_attributes_are_accepted(contents, release_recipe):
+    references = PlaceholderDispatch.references(contents)
+    assert PlaceholderDispatch.validate(release_recipe, references) == [ f'{scope}.{name}' for scope, name in references ]
+
+@pytest.mark.parametrize("contents", [ "$recipe.missing$", "$flake.missing$" ])
+def test_unknown_placeholders_are_rejected(contents, release_recipe):
+    with pytest.raises(RecipeDoesNotSupportPlaceholder):
+        PlaceholderDispatch.validate(release_recipe, PlaceholderDispatch.references(contents))
+
+def test_references_are_found_once_per_recipe_class_until_it_gets_reloaded(release_recipe):
+    assert release_recipe.validate_placeholders(templates("$recipe.extra$")) == [ "recipe.extra" ]
+    assert release_recipe.validate_placeholders(templates("$recipe.missing$")) == [ "recipe.extra" ]
+    BaseFlakeRecipe.recipe_reloaded(release_recipe.__class__, [])
+    with pytest.raises(RecipeDoesNotSupportPlaceholder):
+        release_recipe.validate_placeholders(templates("$recipe.missing$"))
+    BaseFlakeRecipe.recipe_reloaded(release_recipe.__class__, [])
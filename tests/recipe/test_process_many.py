@@ -0,0 +1,127 @@
+"""
+tests/recipe/test_process_many.py
+
+This file tests BaseFlakeRecipe.process_many().
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+base_flake_recipe = pytest.importorskip("pythonedanixflakes.recipe.base_flake_recipe")
+BaseFlakeRecipe = base_flake_recipe.BaseFlakeRecipe
+
+from types import SimpleNamespace
+
+@pytest.fixture
+def counted_recipe(make_recipe_class):
+
+    class CountedRecipe(make_recipe_class(BaseFlakeRecipe)):
+        """
+        Recipe counting its instances, and failing for flakes named "broken".
+        """
+        created = 0
+
+        def __init__(self, flake):
+            if flake.name == "broken":
+                raise ValueError("broken flake")
+            super().__init__(flake)
+            CountedRecipe.created += 1
+
+        def stream_templates(self, templates):
+            for template in templates:
+                yield (template["folder"], template["path"], self._flake.name)
+
+    return CountedRecipe
+
+class StreamingFlakeRepo():
+    """
+    Flake repository writing the flakes as it gets them.
+    """
+    def __init__(self):
+        self.created = []
+        self.written = {}
+
+    def create_many(self, requests):
+        result = []
+        for flake, entries, recipe in requests:
+            self.created.append(recipe.created)
+            self.written[recipe._flake.name] = { path: contents for _, path, contents in entries }
+            result.append(f'created {recipe._flake.name}')
+        return result
+
+    def create_streaming(self, flake, entries, recipe):
+        return self.create_many([ (flake, entries, recipe) ])[0]
+
+    def url_for_flake(self, name: str, version: str) -> str:
+        return None
+
+@pytest.fixture
+def use_flake_repo(monkeypatch):
+    """
+    Makes recipes write their flakes to given repository, from a single template.
+    """
+    def use(flakeRepo):
+        templateRepo = SimpleNamespace(find_flake_templates_by_recipe=lambda recipe: [ { "folder": "", "path": "flake.nix", "contents": "" } ])
+        ports = SimpleNamespace(resolveNixTemplateRepo=lambda: templateRepo, resolveFlakeRepo=lambda: flakeRepo)
+        monkeypatch.setattr(base_flake_recipe, "Ports", SimpleNamespace(instance=lambda: ports))
+        return flakeRepo
+    return use
+
+def test_flakes_are_rendered_as_the_flake_repository_gets_to_them(counted_recipe, use_flake_repo, make_flake):
+    flakeRepo = use_flake_repo(StreamingFlakeRepo())
+    flakes = [ make_flake(name) for name in [ "a", "broken", "b", "c" ] ]
+    report = counted_recipe.process_many(flakes)
+    assert flakeRepo.created == [ 2, 3, 4 ]
+    assert flakeRepo.written == { "a": { "flake.nix": "a" }, "b": { "flake.nix": "b" }, "c": { "flake.nix": "c" } }
+    assert [ (entry.flake.name, entry.event, str(entry.error) if entry.error else None) for entry in report.entries ] == [
+        ("a", "created a", None), ("broken", None, "broken flake"), ("b", "created b", None), ("c", "created c", None) ]
+    assert report.stats["flakes"] == 4
+    assert report.stats["rendered"] == 3
+
+def test_process_writes_the_fingerprint_store_in_batches(tmp_path, monkeypatch, counted_recipe, use_flake_repo, make_flake):
+
+    class FingerprintedRecipe(counted_recipe):
+        """
+        Recipe whose flakes always need to be generated.
+        """
+        def check_unchanged(self, templates):
+            return (f'fingerprint of {self._flake.name}', None)
+
+    use_flake_repo(StreamingFlakeRepo())
+    store = base_flake_recipe.FlakeFingerprintStore(str(tmp_path / "fingerprints.json"))
+    writes = []
+    monkeypatch.setattr(store, "write", lambda: writes.append(store.unwritten) or store.__class__.write(store))
+    BaseFlakeRecipe.use_fingerprint_store(store, writeEvery=2)
+    try:
+        for name in [ "a", "b", "c", "d", "e" ]:
+            FingerprintedRecipe(make_flake(name)).process()
+    finally:
+        BaseFlakeRecipe.use_fingerprint_store(None)
+    assert writes == [ 2, 2 ]
+    assert store.unwritten == 1
+    assert store.entry_for("e", "1.0")["fingerprint"] == "fingerprint of e"
+
+class SkippingFlakeRepo(StreamingFlakeRepo):
+    """
+    Flake repository dropping the outcome of the flakes it fails to create.
+    """
+    def create_many(self, requests):
+        return [ outcome for outcome in super().create_many(requests) if not outcome.endswith("b") ]
+
+def test_mismatched_outcomes_are_rejected(counted_recipe, use_flake_repo, make_flake):
+    use_flake_repo(SkippingFlakeRepo())
+    with pytest.raises(RuntimeError):
+        counted_recipe.process_many([ make_flake(name) for name in [ "a", "b", "c" ] ])
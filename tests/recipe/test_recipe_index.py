@@ -0,0 +1,37 @@
+"""
+tests/recipe/test_recipe_index.py
+
+This file tests the RecipeIndex class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.recipe_index import RecipeIndex
+
+def test_recipes_without_type_match_flakes_without_type(make_recipe_class, make_flake):
+    typed = make_recipe_class(name="Typed", _flakes=[], _type="setuptools")
+    untyped = make_recipe_class(name="Untyped", _flakes=[], _type=None)
+    index = RecipeIndex([ typed, untyped ])
+    assert index.recipe_classes_for_type(None) == [ untyped ]
+    assert index.best_match(make_flake("other", "1.0")) is untyped
+    assert index.best_match(make_flake("other", "1.0", "setuptools")) is typed
+    assert index.best_match(make_flake("other", "1.0", "poetry")) is None
+
+def test_name_matches_rank_above_type_matches(make_recipe_class, make_flake):
+    untyped = make_recipe_class(name="Untyped", _flakes=[], _type=None)
+    named = make_recipe_class(name="Named", _flakes=[ { "pkg": "2.*" } ], _type="poetry")
+    index = RecipeIndex([ untyped, named ])
+    assert index.best_match(make_flake("pkg", "1.0")) is named
+    assert index.best_matches([ make_flake("pkg", "2.1"), make_flake("other", "1.0") ]) == [ named, untyped ]
@@ -0,0 +1,64 @@
+"""
+tests/recipe/test_recipe_toml_cache.py
+
+This file tests the RecipeTomlCache class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.recipe_toml_cache import RecipeTomlCache
+
+import os
+
+def misses_reading(path: str) -> int:
+    before = RecipeTomlCache.misses()
+    RecipeTomlCache.read(path)
+    return RecipeTomlCache.misses() - before
+
+def test_entries_are_reused_until_the_file_changes(tmp_path):
+    path = str(tmp_path / "recipe.toml")
+    (tmp_path / "recipe.toml").write_text('[recipe]\nname = "a"\n')
+    os.utime(path, ns=(1, 1))
+    assert misses_reading(path) == 1
+    contents = RecipeTomlCache.read(path)
+    assert RecipeTomlCache.read(path) is contents
+    assert misses_reading(path) == 0
+
+def test_entries_are_invalidated_when_the_size_changes(tmp_path):
+    path = str(tmp_path / "recipe.toml")
+    (tmp_path / "recipe.toml").write_text('[recipe]\nname = "a"\n')
+    os.utime(path, ns=(1, 1))
+    RecipeTomlCache.read(path)
+    (tmp_path / "recipe.toml").write_text('[recipe]\nname = "ab"\n')
+    os.utime(path, ns=(1, 1))
+    assert RecipeTomlCache.read(path) == { "recipe": { "name": "ab" } }
+
+def test_entries_are_invalidated_when_the_modification_time_changes(tmp_path):
+    path = str(tmp_path / "recipe.toml")
+    (tmp_path / "recipe.toml").write_text('[recipe]\nname = "a"\n')
+    os.utime(path, ns=(1, 1))
+    RecipeTomlCache.read(path)
+    (tmp_path / "recipe.toml").write_text('[recipe]\nname = "b"\n')
+    os.utime(path, ns=(2, 2))
+    assert RecipeTomlCache.read(path) == { "recipe": { "name": "b" } }
+
+def test_invalidated_entries_are_parsed_again(tmp_path):
+    path = str(tmp_path / "recipe.toml")
+    (tmp_path / "recipe.toml").write_text('[recipe]\nname = "a"\n')
+    RecipeTomlCache.read(path)
+    RecipeTomlCache.invalidate(path)
+    assert misses_reading(path) == 1
+    RecipeTomlCache.invalidate()
+    assert misses_reading(path) == 1
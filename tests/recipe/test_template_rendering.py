@@ -0,0 +1,113 @@
+"""
+tests/recipe/test_template_rendering.py
+
+This file checks recipe templates render through StringTemplate with the flake and the recipe themselves.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+stringtemplate3 = pytest.importorskip("stringtemplate3")
+
+from pythonedanixflakes.recipe.placeholder_dispatch import PlaceholderDispatch
+
+import threading
+
+TEMPLATE = """greeting: $recipe.greeting$
+names: $recipe.names:{n|<$n$>}; separator=","$
+nested: $recipe:{r|$r.names:{n|[$n$]}$}$
+"""
+
+class StringTemplateNixTemplate():
+    """
+    Template rendered by StringTemplate, which gets the flake and the recipe as attributes, as NixTemplate does.
+    """
+    def __init__(self, folder: str, path: str, contents: str):
+        self.folder = folder
+        self.path = path
+        self.contents = contents
+
+    def render(self, flake, recipe) -> str:
+        template = stringtemplate3.StringTemplate(self.contents)
+        template["flake"] = flake
+        template["recipe"] = recipe
+        return str(template)
+
+class GreetingRecipe():
+    """
+    Recipe providing placeholders as properties.
+    """
+    @property
+    def greeting(self) -> str:
+        return "hello"
+
+    @property
+    def names(self):
+        return [ "a", "b" ]
+
+class DeclarationTemplate(StringTemplateNixTemplate):
+    """
+    Template rendering the dependency declarations of the recipe.
+    """
+    def render(self, flake, recipe) -> str:
+        return f'[{recipe.declaration()}][{recipe.nixpkgs_as_parameter_to_package_nix()}]'
+
+EXPECTED = """greeting: hello
+names: <a>,<b>
+nested: [a][b]
+"""
+
+def test_dispatch_only_sees_direct_references():
+    assert PlaceholderDispatch.references(TEMPLATE) == [ ("recipe", "greeting"), ("recipe", "names") ]
+
+def test_references_through_subtemplates_render_from_the_recipe():
+    assert StringTemplateNixTemplate("", "flake.nix", TEMPLATE).render(None, GreetingRecipe()) == EXPECTED
+
+def test_recipes_render_their_templates_with_themselves(monkeypatch, make_recipe_class, make_flake):
+    base_flake_recipe = pytest.importorskip("pythonedanixflakes.recipe.base_flake_recipe")
+    BaseFlakeRecipe = base_flake_recipe.BaseFlakeRecipe
+    monkeypatch.setattr(base_flake_recipe.NixTemplateCache, "template", classmethod(lambda cls, recipeClass, folder, path, contents: StringTemplateNixTemplate(folder, path, contents)))
+
+    Recipe = make_recipe_class(BaseFlakeRecipe, greeting=GreetingRecipe.greeting, names=GreetingRecipe.names)
+    recipe = Recipe(make_flake())
+    templates = [ { "folder": "", "path": "flake.nix", "contents": TEMPLATE }, { "folder": "", "path": "README.md", "contents": TEMPLATE } ]
+    assert list(recipe.stream_templates(templates)) == [ ("", "flake.nix", EXPECTED), ("", "README.md", EXPECTED) ]
+    Recipe.render_parallelism(2)
+    try:
+        assert [ rendered["contents"] for rendered in recipe.render_templates(templates) ] == [ EXPECTED, EXPECTED ]
+    finally:
+        Recipe.render_parallelism(None)
+
+def test_concurrent_rendering_only_reads_the_dependency_memos(monkeypatch, make_recipe_class, make_flake):
+    base_flake_recipe = pytest.importorskip("pythonedanixflakes.recipe.base_flake_recipe")
+    BaseFlakeRecipe = base_flake_recipe.BaseFlakeRecipe
+    monkeypatch.setattr(base_flake_recipe.NixTemplateCache, "template", classmethod(lambda cls, recipeClass, folder, path, contents: DeclarationTemplate(folder, path, contents)))
+    builders = []
+
+    class Recipe(make_recipe_class(BaseFlakeRecipe)):
+        def extract_dep_template(self, inputs, kind, subtemplates):
+            builders.append(threading.current_thread())
+            return super().extract_dep_template(inputs, kind, subtemplates)
+
+    recipe = Recipe(make_flake())
+    templates = [ { "folder": "", "path": f'file{i}', "contents": "" } for i in range(8) ]
+    Recipe.render_parallelism(4)
+    try:
+        assert [ rendered["contents"] for rendered in recipe.render_templates(templates) ] == [ "[][]" ] * 8
+    finally:
+        Recipe.render_parallelism(None)
+    assert len(builders) == 6 * len(BaseFlakeRecipe.Subtemplates)
+    assert set(builders) == { threading.main_thread() }
@@ -0,0 +1,66 @@
+"""
+tests/recipe/test_toml_parser.py
+
+This file tests the TomlParser class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from pythonedanixflakes.recipe import toml_parser
+from pythonedanixflakes.recipe.toml_parser import TomlParser
+
+from types import SimpleNamespace
+
+BACKENDS = {
+    "tomllib": SimpleNamespace(load=lambda file: { "parsed": ("tomllib", file.read()) }),
+    "tomli": SimpleNamespace(load=lambda file: { "parsed": ("tomli", file.read()) }),
+    "toml": SimpleNamespace(loads=lambda text: { "parsed": ("toml", text) }) }
+
+@pytest.fixture
+def installed(monkeypatch):
+    """
+    Makes only the given backends importable.
+    """
+    def install(*names):
+        def import_module(name):
+            if name not in names:
+                raise ImportError(name)
+            return BACKENDS[name]
+        monkeypatch.setattr(toml_parser, "importlib", SimpleNamespace(import_module=import_module))
+        monkeypatch.setattr(TomlParser, "_backend", None)
+        monkeypatch.setattr(TomlParser, "_module", None)
+    return install
+
+@pytest.mark.parametrize("names, expected", [
+    ([ "tomllib", "tomli", "toml" ], "tomllib"),
+    ([ "tomli", "toml" ], "tomli"),
+    ([ "toml" ], "toml") ])
+def test_backends_are_tried_in_order(installed, names, expected):
+    installed(*names)
+    assert TomlParser.available_backends() == names
+    assert TomlParser.backend() == expected
+
+@pytest.mark.parametrize("backend, expected", [ ("tomllib", ("tomllib", b"a = 1\n")), ("tomli", ("tomli", b"a = 1\n")), ("toml", ("toml", "a = 1\n")) ])
+def test_files_are_read_as_each_backend_expects(installed, tmp_path, backend, expected):
+    installed(backend)
+    (tmp_path / "recipe.toml").write_text("a = 1\n")
+    assert TomlParser.load(str(tmp_path / "recipe.toml")) == { "parsed": expected }
+
+def test_missing_backends_are_reported(installed):
+    installed()
+    with pytest.raises(ImportError):
+        TomlParser.backend()
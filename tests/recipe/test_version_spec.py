@@ -0,0 +1,40 @@
+"""
+tests/recipe/test_version_spec.py
+
+This file tests the VersionSpec class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythonedanixflakes.recipe.version_spec import VersionSpec
+
+def test_specs():
+    assert VersionSpec.parse("1.2.*").contains("1.2.7")
+    assert not VersionSpec.parse(">=1.0,<2.0").contains("2.0")
+    assert VersionSpec.parse("~=1.4").contains("1.9")
+    assert VersionSpec.parse("not-a-spec").contains("not-a-spec")
+
+def test_parse_caches_are_bounded():
+    stats = VersionSpec.cache_stats()
+    for i in range(stats["versions"]["max_size"] + 100):
+        VersionSpec.version(f'1.{i}')
+    for i in range(stats["specs"]["max_size"] + 100):
+        VersionSpec.parse(f'>=1.{i}')
+    stats = VersionSpec.cache_stats()
+    assert stats["versions"]["size"] == stats["versions"]["max_size"]
+    assert stats["specs"]["size"] == stats["specs"]["max_size"]
+    assert VersionSpec.version("1.0").release == (1, 0)
+    assert VersionSpec.version("not a version") is None
+    assert VersionSpec.version("not a version") is None
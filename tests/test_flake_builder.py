@@ -0,0 +1,96 @@
+"""
+tests/test_flake_builder.py
+
+This file tests the FlakeBuilder class.
+
+Copyright (C) 2023-today rydnr's pythoneda/nix-flakes
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+FlakeBuilder = pytest.importorskip("pythonedanixflakes.build.flake_builder").FlakeBuilder
+
+import asyncio
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+def test_staging_counts_the_copied_files_without_walking_the_tree(tmp_path, monkeypatch):
+    source = tmp_path / "flake"
+    (source / "nested").mkdir(parents=True)
+    for path in [ "flake.nix", "README.md", "nested/default.nix" ]:
+        (source / path).write_text(path)
+    destination = str(tmp_path / "staged")
+    assert FlakeBuilder.copy_folder_contents(str(source), destination) == 3
+    assert sorted(os.listdir(destination)) == [ "README.md", "flake.nix", "nested" ]
+
+    async def run_async(args, folder, mergeStderr=False):
+        return (0, "", "")
+
+    def walk(folder):
+        raise AssertionError("the staged tree must not be walked")
+
+    monkeypatch.setattr(FlakeBuilder, "run_async", run_async)
+    monkeypatch.setattr(os, "walk", walk)
+    before = FlakeBuilder.staging_stats()
+    asyncio.run(FlakeBuilder.git_stage_tree_async(destination, 3))
+    after = FlakeBuilder.staging_stats()
+    assert (after["builds"] - before["builds"], after["files"] - before["files"], after["processes"] - before["processes"]) == (1, 3, 2)
+
+def test_cancelling_a_build_kills_its_process_and_removes_its_folder(tmp_path, monkeypatch):
+    if shutil.which("sleep") is None:
+        pytest.skip("sleep is not available")
+    source = tmp_path / "flake"
+    source.mkdir()
+    (source / "flake.nix").write_text("{}")
+    processes = []
+    folders = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+    mkdtemp = tempfile.mkdtemp
+
+    async def tracked_subprocess_exec(*args, **kwargs):
+        process = await create_subprocess_exec(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    def tracked_mkdtemp():
+        folders.append(mkdtemp(dir=str(tmp_path)))
+        return folders[-1]
+
+    async def git_stage_tree_async(folder, files=None):
+        pass
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", tracked_subprocess_exec)
+    monkeypatch.setattr(tempfile, "mkdtemp", tracked_mkdtemp)
+    monkeypatch.setattr(FlakeBuilder, "git_stage_tree_async", git_stage_tree_async)
+    monkeypatch.setattr(FlakeBuilder, "nix_build_async", classmethod(lambda cls, folder, firstAttempt=True: cls.run_async([ "sleep", "30" ], folder)))
+
+    async def build_and_cancel():
+        task = asyncio.ensure_future(FlakeBuilder.build_flake_async(SimpleNamespace(package_name="pkg", package_version="1.0"), str(source)))
+        while not processes:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(build_and_cancel(), 10))
+    assert len(processes) == 1
+    assert processes[0].returncode is not None
+    with pytest.raises(ProcessLookupError):
+        os.kill(processes[0].pid, 0)
+    assert len(folders) == 1
+    assert not os.path.exists(folders[0])
+    assert os.path.exists(source / "flake.nix")